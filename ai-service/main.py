@@ -1,17 +1,54 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 import os
 import re
 import sqlite3
 import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load .env file (for development) first, so WG_LOG_LEVEL set there applies
+load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+
+# Route module loggers (e.g. the LangGraph ingest nodes) to stderr, at WARNING
+# unless WG_LOG_LEVEL says otherwise, so info chatter is dropped before any
+# formatting. Request threads only enqueue records; a listener thread writes
+# them. Runs before the imports below so it applies to both uvicorn and
+# run.py launches; the level is re-read once the user config is loaded.
+_LOG_QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _log_stream_handler)
+# The queue handler only merges the message; the listener adds level and name
+_log_queue_handler = logging.handlers.QueueHandler(_LOG_QUEUE)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(
+    level=os.getenv("WG_LOG_LEVEL", "WARNING").upper(),
+    handlers=[_log_queue_handler],
+)
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)  # flush queued records on exit
+logger = logging.getLogger(__name__)
 
 # LangGraph integration - loads environment variables
-from chapter_ingest_graph import run_chapter_ingest
+from chapter_ingest_graph import run_chapter_ingest, warm_llm_connection
 
 # Markdown normalization utility
-from utils.normalize_md import normalize_markdown, clean_html_artifacts
+from utils.normalize_md import normalize_markdown, clean_html_artifacts, is_normalized
 
 # Vector search service for Story Query Chat
 from vector_search import VectorSearchService
@@ -19,12 +56,12 @@ from vector_search import VectorSearchService
 # TTS service for audio generation
 from tts_service import TTSService
 
-from pathlib import Path
-from dotenv import load_dotenv
-import json
+# Embedding-similarity cache, shared with the ingest graph's implementation
+from semantic_cache import SemanticCache
 
-# Load .env file (for development)
-load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+from langchain_openai import ChatOpenAI
+
+import orjson
 
 
 # Load user config file (for production)
@@ -34,58 +71,237 @@ def load_user_config():
         config_dir = Path.home() / "AppData" / "Roaming" / "Writegeist"
         config_file = config_dir / "config.json"
 
-        if config_file.exists():
-            print(f"Loading config from: {config_file}")
-            with open(config_file, "r") as f:
-                config = json.load(f)
-
-            # Set environment variables from config
-            for key, value in config.items():
-                if value:  # Only set if value is not empty
-                    os.environ[key] = str(value)
-                    print(f"Loaded config: {key}")
-        else:
-            print(f"No config file found at: {config_file}")
+        # Read directly rather than exists() + read: one syscall path, no race
+        try:
+            config = orjson.loads(config_file.read_bytes())
+        except FileNotFoundError:
+            logger.info("No config file found at: %s", config_file)
+            return
+
+        # Set environment variables from config (only non-empty values)
+        loaded = {key: str(value) for key, value in config.items() if value}
+        os.environ.update(loaded)
+        logger.info("Loaded config from %s: %s", config_file, ", ".join(loaded))
     except Exception as e:
-        print(f"Error loading user config: {e}")
+        logger.error("Error loading user config: %s", e)
 
 
 # Load user configuration
 load_user_config()
+# config.json may set WG_LOG_LEVEL too
+logging.getLogger().setLevel(os.getenv("WG_LOG_LEVEL", "WARNING").upper())
+
+# Use the same database file as the frontend (in project root)
+DB_PATH = Path(__file__).parent.parent / "writegeist.db"
+
+# Shared project-document connection, opened lazily so importing the app never
+# creates an empty database file before the frontend does (singleton pattern)
+_DB_LOCK = threading.Lock()
+_DB_CONN: Optional[sqlite3.Connection] = None
+
+# Last normalized project markdown and the database version it was read at
+_MARKDOWN_CACHE: Dict[str, Any] = {"version": None, "markdown": None}
+
+# Recent normalize_markdown results keyed by a digest of their input
+_NORMALIZE_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_NORMALIZE_CACHE_SIZE = 256
+_NORMALIZE_LOCK = threading.Lock()
+
+# Recent get_normalized_section results keyed by (document digest, section)
+_SECTION_CACHE: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+_SECTION_CACHE_SIZE = 64
+_SECTION_LOCK = threading.Lock()
+
+
+def _markdown_digest(markdown: str) -> bytes:
+    """16-byte blake2b digest of a document, used as a compact cache key."""
+    return hashlib.blake2b(markdown.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def normalize_markdown_cached(markdown: str) -> str:
+    """
+    normalize_markdown (with its already-clean fast path) memoized on a
+    16-byte blake2b digest of the input, so re-normalizing an unchanged
+    document or patch is a dict hit. Only the digest is kept as the key, not
+    the (possibly large) input string.
+    """
+    key = _markdown_digest(markdown)
+    with _NORMALIZE_LOCK:
+        normalized = _NORMALIZE_CACHE.get(key)
+        if normalized is not None:
+            _NORMALIZE_CACHE.move_to_end(key)
+            return normalized
+    
+    normalized = normalize_markdown(markdown, fast_path=True)
+    with _NORMALIZE_LOCK:
+        _NORMALIZE_CACHE[key] = normalized
+        if len(_NORMALIZE_CACHE) > _NORMALIZE_CACHE_SIZE:
+            _NORMALIZE_CACHE.popitem(last=False)
+    return normalized
+
+
+def get_db_connection() -> sqlite3.Connection:
+    """Get or create the shared SQLite connection. Hold _DB_LOCK while using it."""
+    global _DB_CONN
+    if _DB_CONN is None:
+        with _DB_LOCK:
+            if _DB_CONN is None:
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    str(DB_PATH), timeout=10.0, check_same_thread=False, isolation_level=None
+                )
+                conn.execute("PRAGMA busy_timeout = 10000")
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-20000")
+                # Create tables once per connection (match frontend schema exactly)
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS project_pages (
+                        id INTEGER PRIMARY KEY,
+                        markdown TEXT NOT NULL
+                    )
+                """
+                )
+                _DB_CONN = conn
+    return _DB_CONN
 
-app = FastAPI()
+
+def _db_version(conn: sqlite3.Connection) -> tuple:
+    """
+    Token that changes whenever the database may have changed. data_version
+    moves when another connection (the frontend) commits, total_changes when
+    we write, so together they detect any update. Call with _DB_LOCK held.
+    """
+    return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+def _remember_markdown(version: tuple, markdown: str):
+    """Cache what load_markdown returns for the document stored at version."""
+    normalized = normalize_markdown_cached(markdown or create_default_project_markdown())
+    with _DB_LOCK:
+        _MARKDOWN_CACHE["version"] = version
+        _MARKDOWN_CACHE["markdown"] = normalized
+    return normalized
+
+
+def check_database_integrity() -> str:
+    """
+    Run PRAGMA integrity_check on the database and return its first result
+    line ("ok" when healthy). This reads every page of the file, so it is kept
+    out of the request path and only run on demand.
+    """
+    conn = get_db_connection()
+    with _DB_LOCK:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+
+
+def close_db_connection():
+    """Close the shared SQLite connection if it was opened."""
+    global _DB_CONN
+    with _DB_LOCK:
+        if _DB_CONN is not None:
+            _DB_CONN.close()
+            _DB_CONN = None
+
+
+def log_database_integrity():
+    """Startup self-test: run the integrity check and log the outcome."""
+    if not DB_PATH.exists():
+        return
+    try:
+        result = check_database_integrity()
+    except Exception as e:
+        logger.error("Database integrity check could not run: %s", e)
+        return
+    if result == "ok":
+        logger.info("Database integrity check passed")
+    else:
+        logger.error("Database integrity check failed: %s", result)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks for the API server."""
+    # Warm the OpenAI connection in the background so startup isn't delayed
+    warmup = asyncio.create_task(warm_llm_connection())
+    # Open the shared connection now; it switches the file to WAL, which
+    # persists, so per-request connections need no journal_mode pragma
+    if DB_PATH.exists():
+        await run_in_threadpool(get_db_connection)
+    # Optionally check the database once per start, off the event loop (keep
+    # a reference so the task is not garbage collected while it runs)
+    integrity_check = None
+    if os.getenv("WG_CHECK_INTEGRITY") == "1":
+        integrity_check = asyncio.create_task(run_in_threadpool(log_database_integrity))
+    yield
+    warmup.cancel()
+    if integrity_check is not None:
+        integrity_check.cancel()
+    if _tts_service_instance is not None:
+        await _tts_service_instance.aclose()
+    if _vector_search_service_instance is not None:
+        _vector_search_service_instance.close()
+    close_db_connection()
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson, which serializes the large markdown
+    and ingest payloads much faster than stdlib json. (FastAPI's own
+    ORJSONResponse is deprecated in favour of response models.)
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=OrjsonResponse)
+
+# Origins allowed by CORS. A frozenset, which CORSMiddleware keeps as-is, so
+# its per-request "origin in allow_origins" check is a hash lookup
+ALLOWED_ORIGINS = frozenset({
+    "http://localhost:3000",  # Webpack dev server
+    "http://127.0.0.1:3000",  # Webpack dev server (alt)
+    "http://localhost:9876",  # Audio server
+    "http://127.0.0.1:9876",  # Audio server (alt)
+})
 
 # Add CORS middleware - SECURE: Only allow localhost
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",  # Webpack dev server
-        "http://127.0.0.1:3000",  # Webpack dev server (alt)
-        "http://localhost:9876",  # Audio server
-        "http://127.0.0.1:9876",  # Audio server (alt)
-    ],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=False,  # No credentials needed for localhost
     allow_methods=["GET", "POST"],  # Only needed methods
     allow_headers=["Content-Type", "Authorization"],  # Only needed headers
+    max_age=7200,  # Let the renderer cache preflights for Chromium's 2h maximum
 )
 
 
-class EchoReq(BaseModel):
+class RequestModel(BaseModel):
+    """
+    Base for request bodies: strict types skip speculative coercion, unknown
+    fields are dropped, and frozen instances make handler mutation an error.
+    """
+    model_config = ConfigDict(extra="ignore", strict=True, frozen=True)
+
+
+class EchoReq(RequestModel):
     text: str
 
 
-class ChapterIngestReq(BaseModel):
+class ChapterIngestReq(RequestModel):
     title: str
     text: str
 
 
-class Patch(BaseModel):
+class Patch(RequestModel):
     section: str                # e.g. "Characters"
     h2: str | None = None       # optional sub-header
     replace: str                # the full markdown block
 
 
-class StoryQueryRequest(BaseModel):
+class StoryQueryRequest(RequestModel):
     """Request model for story query chat."""
     message: str
     top_k: int = 5  # Number of search results to include
@@ -103,12 +319,13 @@ class StoryQueryResponse(BaseModel):
 
 
 @app.post("/echo")
-def echo(req: EchoReq):
-    return {"echo": req.text}
+async def echo(req: EchoReq):
+    # Nothing here blocks, so run on the event loop instead of the threadpool
+    return OrjsonResponse({"echo": req.text})
 
 
 @app.post("/ingest_chapter")
-def ingest_chapter(req: ChapterIngestReq):
+async def ingest_chapter(req: ChapterIngestReq):
     """
     Ingest a chapter and extract metadata using OpenAI GPT-4o via LangGraph workflow.
     """
@@ -118,8 +335,12 @@ def ingest_chapter(req: ChapterIngestReq):
 
     try:
         # Run the LangGraph workflow with OpenAI
-        result = run_chapter_ingest(req.title, req.text)
-        return {"log": result.get("log", []), **result}
+        result = await run_chapter_ingest(req.title, req.text)
+        # The result dict is built fresh per call, so return it as-is; wrapping
+        # it in the response ourselves skips FastAPI's jsonable_encoder walk
+        # over the chapter text and lists (orjson handles the plain types)
+        result.setdefault("log", [])
+        return OrjsonResponse(result)
     except Exception as e:
         # Handle any errors gracefully
         raise HTTPException(
@@ -158,17 +379,15 @@ def get_project_section(section_name: str):
                 detail={"error": "No project document found"}
             )
         
-        section_content = extract_section(markdown_content, section_name)
+        normalized_content = get_normalized_section(markdown_content, section_name.lower())
         
         # Check if section exists
-        if section_content is None:
+        if normalized_content is None:
             raise HTTPException(
                 status_code=404,
                 detail={"error": f"Section '{section_name}' not found"}
             )
         
-        # Normalize the content before returning
-        normalized_content = normalize_markdown(section_content)
         return {"markdown": normalized_content}
         
     except HTTPException:
@@ -181,9 +400,11 @@ def get_project_section(section_name: str):
 
 
 @app.get("/project/raw")
-def get_raw_project_doc():
+def get_raw_project_doc(format: Optional[str] = None):
     """
     Get the raw project document from the database.
+    Pass ?format=raw to get the markdown itself as text/markdown instead of
+    wrapped in JSON, which skips escaping the whole document.
     """
     try:
         # Load markdown with error handling
@@ -199,6 +420,8 @@ def get_raw_project_doc():
             # Return default markdown if none exists
             markdown_content = create_default_project_markdown()
         
+        if format == "raw":
+            return Response(markdown_content, media_type="text/markdown")
         return {"raw_markdown": markdown_content}
         
     except HTTPException:
@@ -235,7 +458,7 @@ def update_raw_project_doc(request: dict):
         
         # Normalize the markdown before saving
         try:
-            normalized_markdown = normalize_markdown(raw_markdown)
+            normalized_markdown = normalize_markdown_cached(raw_markdown)
         except Exception as norm_error:
             raise HTTPException(
                 status_code=400,
@@ -273,30 +496,38 @@ def cleanup_project_doc():
     This fixes corrupted markdown with mixed HTML tags.
     """
     try:
-        # Load current project markdown
-        db_path = Path(__file__).parent.parent / "writegeist.db"
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-        cursor.execute("SELECT markdown FROM project_pages WHERE id = 1")
-        result = cursor.fetchone()
-        
-        if not result:
-            conn.close()
-            return {"error": "No project document found"}
-        
-        original_markdown = result[0]
-        
-        # Clean HTML artifacts and normalize
-        cleaned_markdown = clean_html_artifacts(original_markdown)
-        final_markdown = normalize_markdown(cleaned_markdown)
-        
-        # Save back to database
-        cursor.execute(
-            "UPDATE project_pages SET markdown = ? WHERE id = 1",
-            (final_markdown,)
-        )
-        conn.commit()
-        conn.close()
+        conn = get_db_connection()
+        with _DB_LOCK:
+            # Read, clean and write back in one write transaction so the
+            # frontend can't save in between and have its edit overwritten
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Load current project markdown
+                result = conn.execute("SELECT markdown FROM project_pages WHERE id = 1").fetchone()
+                
+                if not result:
+                    conn.execute("ROLLBACK")
+                    return {"error": "No project document found"}
+                
+                original_markdown = result[0]
+                
+                # Clean HTML artifacts and normalize
+                cleaned_markdown = clean_html_artifacts(original_markdown)
+                final_markdown = normalize_markdown_cached(cleaned_markdown)
+                
+                # Save back to database (nothing to write if already clean)
+                if final_markdown != original_markdown:
+                    conn.execute(
+                        "UPDATE project_pages SET markdown = ? WHERE id = 1",
+                        (final_markdown,)
+                    )
+                conn.execute("COMMIT")
+                version = _db_version(conn)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        
+        _remember_markdown(version, final_markdown)
         
         return {
             "status": "cleaned",
@@ -323,7 +554,7 @@ def normalize_project_doc():
         current_markdown = load_markdown()
         
         # Apply normalization
-        normalized_markdown = normalize_markdown(current_markdown)
+        normalized_markdown = normalize_markdown_cached(current_markdown)
         
         # Save back to database
         save_markdown_to_database(normalized_markdown)
@@ -341,8 +572,129 @@ def normalize_project_doc():
         )
 
 
+@app.get("/admin/integrity")
+def get_database_integrity():
+    """
+    Check the SQLite database for corruption.
+    This is a utility endpoint; regular reads no longer run the check.
+    """
+    try:
+        result = check_database_integrity()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"error": f"Failed to check database integrity: {str(e)}"}
+        )
+    return {"status": "ok" if result == "ok" else "corrupt", "result": result}
+
+
+def write_patch_debug_file(section_name: str, h2: Optional[str], normalized_patch: str):
+    """Write the last applied n8n patch to data/n8n_proposal.md for debugging."""
+    try:
+        data_dir = Path(__file__).parent / "data"
+        data_dir.mkdir(exist_ok=True)
+        outfile = data_dir / "n8n_proposal.md"
+        # One binary write of pre-encoded bytes; no text-layer wrapper
+        outfile.write_bytes(
+            f"### {section_name} / {h2 or '(root)'}\n\n{normalized_patch}".encode("utf-8")
+        )
+    except Exception as file_error:
+        # Don't fail the request if debug file can't be written
+        logger.warning("Could not write debug file: %s", file_error)
+
+
+# Section patches apply as read-modify-write of the whole document, so they
+# are serialized; whichever request holds the lock applies every patch queued
+# behind it and saves once for the batch (group commit)
+_PATCH_LOCK = threading.Lock()
+_PENDING_PATCHES: List[tuple] = []  # (section name, normalized patch, Future)
+_PENDING_LOCK = threading.Lock()
+
+
+def apply_section_patch(section_name: str, normalized_patch: str):
+    """Apply a normalized patch to the stored document. Raises HTTPException on failure."""
+    done: concurrent.futures.Future = concurrent.futures.Future()
+    with _PENDING_LOCK:
+        _PENDING_PATCHES.append((section_name, normalized_patch, done))
+    
+    with _PATCH_LOCK:
+        with _PENDING_LOCK:
+            batch = _PENDING_PATCHES[:]
+            _PENDING_PATCHES.clear()
+        # An empty batch means an earlier lock holder already applied ours
+        if batch:
+            try:
+                _apply_patch_batch(batch)
+            except Exception as e:
+                # Never leave a waiting request without a result
+                for *_, pending in batch:
+                    if not pending.done():
+                        pending.set_exception(e)
+    
+    done.result()
+
+
+def _apply_patch_batch(batch: List[tuple]):
+    """Apply queued patches in arrival order and save the document once. Hold _PATCH_LOCK."""
+    # Load current project markdown
+    current_markdown = load_markdown()
+    if not current_markdown:
+        # Create default markdown if none exists
+        current_markdown = create_default_project_markdown()
+    
+    applied = []
+    for section_name, normalized_patch, done in batch:
+        # Apply the patch to the specified section
+        try:
+            updated_markdown = apply_patch_to_section(current_markdown, section_name, normalized_patch)
+        except Exception as patch_error:
+            done.set_exception(HTTPException(
+                status_code=500,
+                detail={"error": f"Failed to apply patch to section '{section_name}': {str(patch_error)}"}
+            ))
+            continue
+        
+        # Normalize the entire document after each patch, as if they had been
+        # saved one by one. Splicing a normalized patch into a normalized
+        # document usually yields normalized text, so skip the full-document
+        # pass whenever a cheap scan proves it a no-op
+        try:
+            if not is_normalized(updated_markdown):
+                updated_markdown = normalize_markdown_cached(updated_markdown)
+        except Exception as final_norm_error:
+            logger.error("Final document normalization failed: %s", final_norm_error)
+            done.set_exception(HTTPException(
+                status_code=500,
+                detail={"error": "Document processing failed"}
+            ))
+            continue
+        
+        current_markdown = updated_markdown
+        applied.append(done)
+    
+    if not applied:
+        return
+    
+    # Save the updated markdown back to the database
+    try:
+        save_markdown_to_database(current_markdown)
+    except Exception as save_error:
+        logger.error("Database save operation failed: %s", save_error)
+        for done in applied:
+            done.set_exception(HTTPException(
+                status_code=500,
+                detail={"error": "Failed to save changes"}
+            ))
+        return
+    
+    if len(batch) > 1:
+        logger.info("Saved %d coalesced n8n patches in one write", len(applied))
+    for done in applied:
+        done.set_result(None)
+
+
 @app.post("/n8n/proposal", status_code=202)
-def accept_patch(patch: Patch):
+def accept_patch(patch: Patch, background_tasks: BackgroundTasks):
     """
     n8n sends a complete markdown block that should replace the
     current block and update the project database.
@@ -369,9 +721,10 @@ def accept_patch(patch: Patch):
         if section_name == "FULL_DOCUMENT_SYNC":
             # Replace the entire document with the provided content
             try:
-                normalized_content = normalize_markdown(patch.replace)
-                save_markdown_to_database(normalized_content)
-                print(f"Full document sync completed: {len(normalized_content)} characters")
+                normalized_content = normalize_markdown_cached(patch.replace)
+                with _PATCH_LOCK:
+                    save_markdown_to_database(normalized_content)
+                logger.info("Full document sync completed: %d characters", len(normalized_content))
                 return {"status": "success", "message": "Full document synced successfully"}
             except Exception as sync_error:
                 raise HTTPException(
@@ -384,81 +737,35 @@ def accept_patch(patch: Patch):
         valid_sections = ["Ideas-Notes", "Setting", "Full Outline", "Characters", "Plot", "Themes"]
         if section_name not in valid_sections:
             # Log warning but don't fail - allow dynamic sections
-            print(f"Warning: Unknown section '{section_name}'. Valid sections: {valid_sections}")
-        
-        # Load current project markdown with error handling
-        try:
-            current_markdown = load_markdown()
-        except Exception as db_error:
-            raise HTTPException(
-                status_code=500,
-                detail={"error": f"Failed to load current project: {str(db_error)}"}
-            )
-        
-        if not current_markdown:
-            # Create default markdown if none exists
-            current_markdown = create_default_project_markdown()
+            logger.warning("Unknown section '%s'. Valid sections: %s", section_name, valid_sections)
         
         # Normalize the patch content before applying
         try:
-            normalized_patch = normalize_markdown(patch.replace)
+            normalized_patch = normalize_markdown_cached(patch.replace)
         except Exception as norm_error:
             raise HTTPException(
                 status_code=400,
                 detail={"error": f"Failed to normalize patch content: {str(norm_error)}"}
             )
         
-        # Apply the patch to the specified section
-        try:
-            updated_markdown = apply_patch_to_section(current_markdown, section_name, normalized_patch)
-        except Exception as patch_error:
-            raise HTTPException(
-                status_code=500,
-                detail={"error": f"Failed to apply patch to section '{section_name}': {str(patch_error)}"}
-            )
-        
-        # Normalize the entire document before saving
-        try:
-            final_markdown = normalize_markdown(updated_markdown)
-        except Exception as final_norm_error:
-            print(f"[ERROR] Final document normalization failed: {str(final_norm_error)}")
-            raise HTTPException(
-                status_code=500,
-                detail={"error": "Document processing failed"}
-            )
-        
-        # Save the updated markdown back to the database
-        try:
-            save_markdown_to_database(final_markdown)
-        except Exception as save_error:
-            print(f"[ERROR] Database save operation failed: {str(save_error)}")
-            raise HTTPException(
-                status_code=500,
-                detail={"error": "Failed to save changes"}
-            )
+        # Apply the patch to the specified section and save (together with
+        # any patches that arrived concurrently)
+        apply_section_patch(section_name, normalized_patch)
         
-        # Also write to temporary file for debugging
-        try:
-            data_dir = Path(__file__).parent / "data"
-            data_dir.mkdir(exist_ok=True)
-            outfile = data_dir / "n8n_proposal.md"
-            outfile.write_text(
-                f"### {section_name} / {patch.h2 or '(root)'}\n\n{normalized_patch}",
-                encoding="utf-8",
-            )
-        except Exception as file_error:
-            # Don't fail the request if debug file can't be written
-            print(f"Warning: Could not write debug file: {file_error}")
+        # Also write to temporary file for debugging (opt-in via WG_DEBUG),
+        # after the response has been sent
+        if os.getenv("WG_DEBUG"):
+            background_tasks.add_task(write_patch_debug_file, section_name, patch.h2, normalized_patch)
         
         # Log the received patch
-        print(f"Applied n8n patch for section '{section_name}': {len(normalized_patch)} characters")
+        logger.info("Applied n8n patch for section '%s': %d characters", section_name, len(normalized_patch))
         
         return {"status": "accepted"}
         
     except HTTPException:
         raise  # Re-raise HTTP exceptions
     except Exception as e:
-        print(f"[ERROR] Patch processing failed: {str(e)}")
+        logger.error("Patch processing failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail={"error": "Failed to process request"},
@@ -469,71 +776,60 @@ def accept_patch(patch: Patch):
 def load_markdown():
     """Load the project markdown from the SQLite database (same as frontend)"""
     try:
-        # Use the same database file as the frontend (in project root)
-        db_path = Path(__file__).parent.parent / "writegeist.db"
+        db_path = DB_PATH
 
         # Check if database file exists and is readable
         if not db_path.exists():
-            print(f"Database file not found at {db_path}, creating default project")
+            logger.info("Database file not found at %s, creating default project", db_path)
             return create_default_project_doc(db_path)
         
         if not os.access(db_path, os.R_OK):
-            print(f"[ERROR] Database file not readable: {db_path}")
+            logger.error("Database file not readable: %s", db_path)
             raise Exception("Database file access denied")
 
-        # Connect to database with timeout and error handling
+        # Reuse the shared connection (opened with timeout and busy timeout)
         try:
-            conn = sqlite3.connect(str(db_path), timeout=10.0)  # 10 second timeout
-            conn.execute("PRAGMA busy_timeout = 10000")  # 10 second busy timeout
-            cursor = conn.cursor()
+            conn = get_db_connection()
         except sqlite3.OperationalError as db_error:
             raise Exception(f"Failed to connect to database: {str(db_error)}")
         except Exception as conn_error:
-            print(f"[ERROR] Database connection failed: {str(conn_error)}")
+            logger.error("Database connection failed: %s", conn_error)
             raise Exception("Database connection failed")
 
         try:
-            # Test database integrity
-            cursor.execute("PRAGMA integrity_check")
-            integrity_result = cursor.fetchone()
-            if integrity_result[0] != 'ok':
-                raise Exception(f"Database integrity check failed: {integrity_result[0]}")
+            with _DB_LOCK:
+                version = _db_version(conn)
+                if version == _MARKDOWN_CACHE["version"]:
+                    return _MARKDOWN_CACHE["markdown"]
 
-            # Get the project markdown from project_pages table
-            cursor.execute("SELECT markdown FROM project_pages WHERE id = 1")
-            result = cursor.fetchone()
+                # Get the project markdown from project_pages table
+                result = conn.execute("SELECT markdown FROM project_pages WHERE id = 1").fetchone()
 
             if result:
                 markdown_content = result[0]
                 if not markdown_content:
-                    print("Warning: Empty markdown content in database, using default")
+                    logger.warning("Empty markdown content in database, using default")
                     markdown_content = create_default_project_markdown()
             else:
                 # No project document exists, create default
-                print("No project document found in database, creating default")
+                logger.info("No project document found in database, creating default")
                 markdown_content = create_default_project_doc(db_path)
 
             # Normalize the markdown before returning
-            normalized_content = normalize_markdown(markdown_content)
-            return normalized_content
+            return _remember_markdown(version, markdown_content)
 
         except sqlite3.Error as sql_error:
-            print(f"[ERROR] Database query failed: {str(sql_error)}")
+            logger.error("Database query failed: %s", sql_error)
             raise Exception("Database query failed")
         except Exception as query_error:
-            print(f"[ERROR] Database query execution failed: {str(query_error)}")
+            logger.error("Database query execution failed: %s", query_error)
             raise Exception("Database operation failed")
-        finally:
-            try:
-                conn.close()
-            except:
-                pass  # Ignore close errors
 
     except Exception as e:
-        print(f"Error loading from database: {e}")
+        logger.error("Error loading from database: %s", e)
         # Fallback to default content with detailed error info
         fallback_content = create_default_project_markdown()
-        print(f"Using fallback content due to database error: {str(e)}")
+        logger.warning("Using fallback content due to database error: %s", e)
         return fallback_content
 
 
@@ -545,123 +841,132 @@ def create_default_project_doc(db_path):
         # Ensure directory exists
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        conn = sqlite3.connect(str(db_path), timeout=10.0)
-        conn.execute("PRAGMA busy_timeout = 10000")
-        cursor = conn.cursor()
-
-        # Create tables if they don't exist (same as frontend)
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS project_pages (
-                id INTEGER PRIMARY KEY,
-                markdown TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
+        # The shared connection creates the project_pages table on first use
+        conn = get_db_connection()
 
         # Insert default project document
-        cursor.execute(
-            "INSERT OR REPLACE INTO project_pages (id, markdown) VALUES (1, ?)",
-            (default_markdown,),
-        )
+        with _DB_LOCK:
+            conn.execute(
+                "INSERT OR REPLACE INTO project_pages (id, markdown) VALUES (1, ?)",
+                (default_markdown,),
+            )
 
-        conn.commit()
-        conn.close()
-        print(f"Created default project document in database: {db_path}")
+        logger.info("Created default project document in database: %s", db_path)
         return default_markdown
 
     except sqlite3.Error as sql_error:
-        print(f"SQLite error creating default project: {sql_error}")
+        logger.error("SQLite error creating default project: %s", sql_error)
         return default_markdown
     except Exception as e:
-        print(f"Error creating default project: {e}")
+        logger.error("Error creating default project: %s", e)
         return default_markdown
 
 
 
+# Any "## " header line prefix. [^\S\n] is \s without the newline, so a
+# match never runs past its own line.
+_H2_ANY = re.compile(r'^[^\S\n]*##[^\S\n]+', re.M)
+
+
+@functools.lru_cache(maxsize=8)
+def _header_index(markdown: str) -> tuple:
+    """
+    Index the document's "## " headers in one pass.
+    Returns the (line start, line end) span of every header in order, and a
+    dict from lowercased header title to the position of its first span.
+    Memoized on the markdown string, which load_markdown keeps identical
+    between writes, so repeated section lookups never rescan the document.
+    """
+    spans: List[tuple] = []
+    first_by_title: Dict[str, int] = {}
+    for match in _H2_ANY.finditer(markdown):
+        line_end = markdown.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(markdown)
+        title = markdown[match.end():line_end].rstrip().lower()
+        first_by_title.setdefault(title, len(spans))
+        spans.append((match.start(), line_end))
+    return spans, first_by_title
+
+
 def extract_section(markdown: str, section_name: str) -> str:
     """Extract section content between ## headers"""
-    lines = markdown.split('\n')
-    section_start = None
-    section_end = len(lines)
-    
-    # Find the start of our section
-    for i, line in enumerate(lines):
-        if re.match(rf'^\s*##\s+{re.escape(section_name)}\s*$', line, re.I):
-            section_start = i + 1
-            break
-    
-    if section_start is None:
+    # Find our section header in the document's header index
+    spans, first_by_title = _header_index(markdown)
+    index = first_by_title.get(section_name.lower())
+    if index is None:
         return ""
     
-    # Find the end (next ## header)
-    for i in range(section_start, len(lines)):
-        if re.match(r'^\s*##\s+', lines[i]):
-            section_end = i
-            break
-    
-    # Extract and clean the content
-    content_lines = lines[section_start:section_end]
-    # Remove empty lines at start and end
-    while content_lines and not content_lines[0].strip():
-        content_lines.pop(0)
-    while content_lines and not content_lines[-1].strip():
-        content_lines.pop()
+    # The body runs from the line after the header up to the next ## header
+    body_start = spans[index][1] + 1
+    body_end = spans[index + 1][0] - 1 if index + 1 < len(spans) else len(markdown)
     
+    # Extract and clean the content, removing empty lines at start and end
+    content = _trim_blank_lines(markdown[body_start:body_end]) if body_start <= body_end else ""
+
     # Clean up extra asterisks that might be added by n8n processing
     # If the entire section starts with a standalone asterisk, remove it
-    if content_lines and content_lines[0].strip() == '*':
-        content_lines.pop(0)
-        # Also remove any empty lines after the asterisk
-        while content_lines and not content_lines[0].strip():
-            content_lines.pop(0)
+    # (along with any empty lines after it)
+    first_line, newline, rest = content.partition('\n')
+    if first_line.strip() == '*':
+        content = _trim_blank_lines(rest) if newline else ""
+
+    return content
+
+
+def _trim_blank_lines(text: str) -> str:
+    """Drop whole whitespace-only lines from both ends, keeping inner indentation"""
+    first = len(text) - len(text.lstrip())
+    if first == len(text):
+        return ""
+    last = len(text.rstrip())
+    start = text.rfind('\n', 0, first) + 1
+    end = text.find('\n', last)
+    return text[start:] if end == -1 else text[start:end]
+
+
+def get_normalized_section(markdown: str, section_name: str) -> Optional[str]:
+    """
+    Extract and normalize a section, memoized on a digest of the markdown
+    plus the section name, so the cache never holds copies of the document.
+    """
+    key = (_markdown_digest(markdown), section_name)
+    with _SECTION_LOCK:
+        if key in _SECTION_CACHE:
+            _SECTION_CACHE.move_to_end(key)
+            return _SECTION_CACHE[key]
     
-    return '\n'.join(content_lines)
+    section_content = extract_section(markdown, section_name)
+    normalized = None if section_content is None else normalize_markdown_cached(section_content)
+    with _SECTION_LOCK:
+        _SECTION_CACHE[key] = normalized
+        if len(_SECTION_CACHE) > _SECTION_CACHE_SIZE:
+            _SECTION_CACHE.popitem(last=False)
+    return normalized
 
 
 def apply_patch_to_section(markdown: str, section_name: str, new_content: str) -> str:
     """Replace the content of a specific section in the markdown"""
-    lines = markdown.split('\n')
-    section_header_index = None
-    section_start = 0
-    section_end = len(lines)
-    
     # Find the section header
-    for i, line in enumerate(lines):
-        if re.match(rf'^\s*##\s+{re.escape(section_name)}\s*$', line, re.I):
-            section_header_index = i
-            section_start = i + 1
-            break
+    spans, first_by_title = _header_index(markdown)
+    index = first_by_title.get(section_name.lower())
     
-    if section_header_index is None:
-        # Section doesn't exist, add it at the end
-        if lines and lines[-1].strip():
-            lines.append('')  # Add blank line before new section
-        lines.append(f'## {section_name}')
-        lines.append('')
-        lines.extend(new_content.split('\n'))
-        return '\n'.join(lines)
+    if index is None:
+        # Section doesn't exist, add it at the end (after a blank line)
+        last_line = markdown[markdown.rfind('\n') + 1:]
+        separator = '\n\n' if last_line.strip() else '\n'
+        return f"{markdown}{separator}## {section_name}\n\n{new_content}"
     
-    # Find the end of the section (next ## header)
-    for i in range(section_start, len(lines)):
-        if re.match(r'^\s*##\s+', lines[i]):
-            section_end = i
-            break
-    
-    # Replace the section content
-    new_lines = lines[:section_start]
-    
-    # Add the new content
+    # Keep everything through the header line, then the new content, then
+    # the remaining sections starting at the next ## header
+    parts = [markdown[:spans[index][1]]]
     if new_content.strip():
-        new_lines.extend(new_content.split('\n'))
+        parts.append(new_content)
     
-    # Add remaining lines after the section
-    if section_end < len(lines):
-        new_lines.extend(lines[section_end:])
+    if index + 1 < len(spans):
+        parts.append(markdown[spans[index + 1][0]:])
     
-    return '\n'.join(new_lines)
+    return '\n'.join(parts)
 
 
 def save_markdown_to_database(markdown: str):
@@ -671,65 +976,130 @@ def save_markdown_to_database(markdown: str):
         if markdown is None:
             raise ValueError("Markdown content cannot be None")
         
-        # Use the same database file as the frontend (in project root)
-        db_path = Path(__file__).parent.parent / "writegeist.db"
-        
-        # Ensure directory exists
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Connect to database with timeout and error handling
+        # Reuse the shared connection (creates the directory and table if needed)
         try:
-            conn = sqlite3.connect(str(db_path), timeout=10.0)
-            conn.execute("PRAGMA busy_timeout = 10000")
-            cursor = conn.cursor()
+            conn = get_db_connection()
         except sqlite3.OperationalError as db_error:
             raise Exception(f"Failed to connect to database for save: {str(db_error)}")
         
         try:
-            # Create tables if they don't exist (match frontend schema exactly)
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS project_pages (
-                    id INTEGER PRIMARY KEY,
-                    markdown TEXT NOT NULL
+            # Update the project markdown (match frontend approach); the
+            # connection is in autocommit mode so this single statement is atomic
+            with _DB_LOCK:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO project_pages (id, markdown) 
+                    VALUES (1, ?)
+                    """,
+                    (markdown,),
                 )
-            """
-            )
+                version = _db_version(conn)
+            logger.info("Successfully saved updated markdown to database (%d characters)", len(markdown))
             
-            # Update the project markdown (match frontend approach)
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO project_pages (id, markdown) 
-                VALUES (1, ?)
-                """,
-                (markdown,),
-            )
-            
-            conn.commit()
-            print(f"Successfully saved updated markdown to database ({len(markdown)} characters)")
+            # Write-through: the next load_markdown is served without a SELECT
+            _remember_markdown(version, markdown)
             
         except sqlite3.Error as sql_error:
-            conn.rollback()
             raise Exception(f"Database save error: {str(sql_error)}")
         except Exception as save_error:
-            conn.rollback()
             raise Exception(f"Error saving to database: {str(save_error)}")
-        finally:
-            try:
-                conn.close()
-            except:
-                pass  # Ignore close errors
         
     except Exception as e:
-        print(f"Error saving to database: {e}")
+        logger.error("Error saving to database: %s", e)
         raise  # Re-raise to be handled by caller
 
 
-# Initialize vector search service
+# Initialize vector search service (singleton pattern)
+_vector_search_service_instance = None
+
 def get_vector_search_service():
-    """Get or create vector search service instance."""
-    db_path = Path(__file__).parent.parent / "writegeist.db"
-    return VectorSearchService(str(db_path))
+    """
+    Get or create vector search service instance (singleton).
+    The service serializes use of its one SQLite connection with a lock,
+    so one instance is safe to share across threadpool requests.
+    """
+    global _vector_search_service_instance
+    if _vector_search_service_instance is None:
+        _vector_search_service_instance = VectorSearchService(str(DB_PATH))
+    return _vector_search_service_instance
+
+
+# Paraphrased story questions reuse the earlier answer while the database is
+# unchanged; any write (e.g. a chapter edit) clears it. Namespaces include the
+# database version, so an answer finished after a write is never served.
+_STORY_QUERY_CACHE = SemanticCache(
+    threshold=0.95, max_entries=256,
+    db_path=str(Path(__file__).parent.parent / ".embedding_cache.db"),
+)
+_STORY_QUERY_CACHE_VERSION: Optional[tuple] = None
+
+
+def _story_query_db_version() -> Optional[tuple]:
+    """
+    Read the database change token; blocks on _DB_LOCK, so run it in the
+    threadpool. None while the frontend has not created the database yet.
+    """
+    if not DB_PATH.exists():
+        return None
+    conn = get_db_connection()
+    with _DB_LOCK:
+        return _db_version(conn)
+
+
+async def _story_query_cache_key(top_k: int) -> str:
+    """Return the cache namespace for a query, clearing answers the database has outdated."""
+    global _STORY_QUERY_CACHE_VERSION
+    version = await run_in_threadpool(_story_query_db_version)
+    if version != _STORY_QUERY_CACHE_VERSION:
+        _STORY_QUERY_CACHE.clear()
+        _STORY_QUERY_CACHE_VERSION = version
+    return f"story_query_chat:{version}:{top_k}"
+
+
+async def _lookup_story_query(request: StoryQueryRequest) -> tuple:
+    """Return (cache key, cached response or None); never raises."""
+    try:
+        cache_key = await _story_query_cache_key(request.top_k)
+        return cache_key, await _STORY_QUERY_CACHE.lookup(request.message, cache_key)
+    except Exception as e:
+        logger.warning("Story query cache lookup failed: %s", e)
+        return None, None
+
+
+async def _store_story_query(request: StoryQueryRequest, cache_key: str,
+                             chat_response: StoryQueryResponse) -> None:
+    """Cache an answer unless the database changed while it was computed; never raises."""
+    # The namespace embeds the version it was looked up at
+    if cache_key != f"story_query_chat:{_STORY_QUERY_CACHE_VERSION}:{request.top_k}":
+        return
+    try:
+        await _STORY_QUERY_CACHE.update(request.message, cache_key, chat_response)
+    except Exception as e:
+        logger.warning("Story query cache update failed: %s", e)
+
+
+def _story_query_response(chat_response: StoryQueryResponse) -> OrjsonResponse:
+    """
+    Render a story answer directly. model_dump already yields JSON-ready
+    types, so this skips FastAPI's jsonable_encoder walk over the full
+    chapter texts in search_results.
+    """
+    return OrjsonResponse(chat_response.model_dump())
+
+
+@functools.lru_cache(maxsize=1)
+def get_story_llm() -> ChatOpenAI:
+    """
+    Get the shared GPT-4o client for story chat (singleton), so requests skip
+    client construction and reuse its pooled connections. Only called after
+    the endpoint has checked OPENAI_API_KEY.
+    """
+    return ChatOpenAI(model="gpt-4o", temperature=0.7, max_retries=2)
+
+
+# Cap concurrent GPT-4o story answers so a burst of questions cannot pile up
+# on OpenAI rate limits
+_STORY_QUERY_LLM_SEMAPHORE = asyncio.Semaphore(3)
 
 
 # Initialize TTS service (singleton pattern)
@@ -740,12 +1110,12 @@ def get_tts_service():
     global _tts_service_instance
     if _tts_service_instance is None:
         _tts_service_instance = TTSService()
-        # print("TTS Service singleton initialized")  # Verbose: commented out
+        # logger.debug("TTS Service singleton initialized")  # Verbose: commented out
     return _tts_service_instance
 
 
 @app.post("/story_query_chat")
-def story_query_chat(request: StoryQueryRequest):
+async def story_query_chat(request: StoryQueryRequest):
     """
     Chat with your story using vector search + GPT-4o.
     Searches for relevant content and generates contextual responses.
@@ -758,19 +1128,27 @@ def story_query_chat(request: StoryQueryRequest):
         # Initialize vector search service
         vector_service = get_vector_search_service()
         
-        # Search for relevant content
-        search_results = vector_service.search_similar_content(
+        # A paraphrase of an earlier question skips the search and the LLM
+        cache_key, cached = await _lookup_story_query(request)
+        if cached is not None:
+            logger.info("[STORY CHAT] Served from semantic cache")
+            return _story_query_response(cached.model_copy(update={"query_used": request.message}))
+        
+        # Search for relevant content (blocking SQLite read + keyword
+        # scoring, so off the event loop)
+        search_results = await run_in_threadpool(
+            vector_service.search_similar_content,
             request.message, 
             top_k=request.top_k
         )
         
         if not search_results:
-            return StoryQueryResponse(
+            return _story_query_response(StoryQueryResponse(
                 response="I couldn't find any relevant content in your story to answer that question. Try asking about specific characters, locations, or events that might be mentioned in your chapters.",
                 citations=[],
                 search_results=[],
                 query_used=request.message
-            )
+            ))
         
         # Build context from search results
         context_parts = []
@@ -791,8 +1169,7 @@ def story_query_chat(request: StoryQueryRequest):
         context = "\n".join(context_parts)
         
         # Generate response using GPT-4o
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model="gpt-4o", temperature=0.7)
+        llm = get_story_llm()
         
         prompt = f"""
         You are a helpful AI assistant that answers questions about a user's story based on the provided context from their chapters.
@@ -812,9 +1189,10 @@ def story_query_chat(request: StoryQueryRequest):
         Response:
         """
         
-        response = llm.invoke(prompt)
+        async with _STORY_QUERY_LLM_SEMAPHORE:
+            response = await llm.ainvoke(prompt)
         
-        return StoryQueryResponse(
+        chat_response = StoryQueryResponse(
             response=str(response.content),
             citations=citations,
             search_results=[{
@@ -826,6 +1204,11 @@ def story_query_chat(request: StoryQueryRequest):
             query_used=request.message
         )
         
+        if cache_key is not None:
+            await _store_story_query(request, cache_key, chat_response)
+        
+        return _story_query_response(chat_response)
+        
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -874,9 +1257,7 @@ def cleanup_embeddings_for_chapter(chapter_id: str):
         vector_service = get_vector_search_service()
         
         # Delete embeddings for the chapter
-        db_path = Path(__file__).parent.parent / "writegeist.db"
-        with sqlite3.connect(str(db_path)) as conn:
-            conn.execute("PRAGMA journal_mode=WAL;")
+        with sqlite3.connect(str(DB_PATH)) as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM chapter_embeddings WHERE chapter_id = ?", (chapter_id,))
             deleted_count = cursor.rowcount
@@ -917,11 +1298,11 @@ def generate_embeddings_for_chapter(chapter_id: str):
 
 
 # TTS Endpoints
-class AudioGenerateRequest(BaseModel):
+class AudioGenerateRequest(RequestModel):
     chapter_id: str
 
 
-class AudioStatusRequest(BaseModel):
+class AudioStatusRequest(RequestModel):
     chapter_id: str
 
 
@@ -931,16 +1312,26 @@ async def generate_audio(request: AudioGenerateRequest, background_tasks: Backgr
     Generate audio for a chapter (runs in background).
     """
     try:
-        tts_service = get_tts_service()
+        # Service setup and the record INSERT are blocking file/SQLite work,
+        # so keep them off the event loop
+        tts_service = await run_in_threadpool(get_tts_service)
+        
+        # Fail fast on a missing/empty chapter or a full disk, before any
+        # record or background job exists
+        try:
+            text = await run_in_threadpool(tts_service.preflight, request.chapter_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e)})
         
         # Create audio record
-        audio_id = tts_service.create_audio_record(request.chapter_id)
+        audio_id = await run_in_threadpool(tts_service.create_audio_record, request.chapter_id)
         
         # Add background task to generate audio
         background_tasks.add_task(
             tts_service.process_chapter,
             request.chapter_id,
-            audio_id
+            audio_id,
+            text
         )
         
         return {
@@ -948,8 +1339,10 @@ async def generate_audio(request: AudioGenerateRequest, background_tasks: Backgr
             "audio_id": audio_id,
             "message": "Audio generation started"
         }
+    except HTTPException:
+        raise  # Re-raise HTTP exceptions
     except Exception as e:
-        print(f"[ERROR] Audio generation failed: {str(e)}")
+        logger.error("Audio generation failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail={"error": "Failed to start audio generation"}
@@ -976,7 +1369,7 @@ def get_audio_status(chapter_id: str):
                 "message": "No audio found for chapter"
             }
     except Exception as e:
-        print(f"[ERROR] Audio status retrieval failed: {str(e)}")
+        logger.error("Audio status retrieval failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail={"error": "Failed to get audio status"}
@@ -997,39 +1390,41 @@ def cleanup_audio_files():
             "message": "Audio cleanup completed"
         }
     except Exception as e:
-        print(f"[ERROR] Audio cleanup failed: {str(e)}")
+        logger.error("Audio cleanup failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail={"error": "Failed to cleanup audio files"}
         )
 
 
+def _delete_audio_file(audio_path: Path):
+    """Delete an audio file if it exists."""
+    if audio_path.exists():
+        audio_path.unlink()
+        logger.info("Audio file deleted: %s", audio_path)
+
+
 @app.delete("/audio/cleanup/{chapter_id}")
-def cleanup_audio_for_chapter(chapter_id: str):
+async def cleanup_audio_for_chapter(chapter_id: str):
     """
     Clean up audio files for a specific deleted chapter.
     """
     try:
-        tts_service = get_tts_service()
+        tts_service = await run_in_threadpool(get_tts_service)
         
         # Get audio info before cleanup
-        audio_data = tts_service.get_audio_status(chapter_id)
+        audio_data = await run_in_threadpool(tts_service.get_audio_status, chapter_id)
         
         if audio_data and audio_data.get('audio_url'):
             audio_path = Path(audio_data['audio_url'])
             
-            # Delete the audio file if it exists
-            if audio_path.exists():
-                audio_path.unlink()
-                print(f"Audio file deleted: {audio_path}")
-            
-            # Delete database record (should already be handled by CASCADE, but being explicit)
-            conn = sqlite3.connect(tts_service.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM chapter_audio WHERE chapter_id = ?", (chapter_id,))
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            # The file unlink and the record delete are independent, so run
+            # them side by side in the threadpool. The record delete should
+            # already be handled by CASCADE, but being explicit
+            _, deleted_count = await asyncio.gather(
+                run_in_threadpool(_delete_audio_file, audio_path),
+                run_in_threadpool(tts_service.delete_audio_records, chapter_id),
+            )
             
             return {
                 "success": True,
@@ -1045,16 +1440,15 @@ def cleanup_audio_for_chapter(chapter_id: str):
             }
             
     except Exception as e:
-        print(f"[ERROR] Audio cleanup for chapter {chapter_id} failed: {str(e)}")
+        logger.error("Audio cleanup for chapter %s failed: %s", chapter_id, e)
         raise HTTPException(
             status_code=500,
             detail={"error": "Failed to cleanup audio for chapter"}
         )
 
 
-def create_default_project_markdown():
-    """Create default project markdown structure"""
-    return """# My Project
+# Default project markdown structure, shared by every caller
+DEFAULT_PROJECT_MARKDOWN = """# My Project
 
 ## Ideas-Notes
 
@@ -1063,3 +1457,8 @@ def create_default_project_markdown():
 ## Full Outline
 
 ## Characters"""
+
+
+def create_default_project_markdown():
+    """Create default project markdown structure"""
+    return DEFAULT_PROJECT_MARKDOWN
@@ -0,0 +1,173 @@
+"""
+Semantic prompt-response cache for the chapter ingestion graph.
+
+Re-ingesting a chapter after a typo fix or reformatting produces nearly the
+same excerpt, so instead of an exact key we embed the excerpt and reuse the
+stored response of the nearest neighbour when cosine similarity >= threshold.
+Embeddings can also be persisted to SQLite so a restart does not re-embed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache over L2-normalized text embeddings.
+
+    Entries are namespaced by ``llm_key`` (the graph node name) so a cached
+    summary can never be returned for a tropes prompt and vice versa.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 512,
+                 model: str = "text-embedding-3-small", db_path: Optional[str] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model = model
+        # Optional SQLite file that keeps embeddings across restarts
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._embeddings: Optional[OpenAIEmbeddings] = None
+        # llm_key -> (inner-product index, responses aligned with index ids)
+        self._indexes: Dict[str, Tuple[faiss.IndexFlatIP, List[Any]]] = {}
+        # Every node of one ingest embeds the same excerpt, so remember recent vectors
+        self._vectors: Dict[str, np.ndarray] = {}
+        # Text hash -> embedding in progress, so fanned-out nodes share one request
+        self._pending: Dict[bytes, "asyncio.Future[np.ndarray]"] = {}
+
+    async def _embed(self, text: str) -> np.ndarray:
+        """Embed and L2-normalize text, reusing the vector for repeated texts."""
+        vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+
+        key = hashlib.sha256(f"{self.model}\n{text}".encode("utf-8", "surrogatepass")).digest()
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Shield so a cancelled waiter does not cancel the shared request
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            vector = await self._compute_vector(key, text)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters re-raise it; don't log it as unretrieved when there are none
+                future.exception()
+            raise
+        else:
+            future.set_result(vector)
+        finally:
+            del self._pending[key]
+
+        if len(self._vectors) >= self.max_entries:
+            self._vectors.pop(next(iter(self._vectors)))
+        self._vectors[text] = vector
+        return vector
+
+    async def _compute_vector(self, key: bytes, text: str) -> np.ndarray:
+        """Load the persisted vector for key, or embed text and persist it."""
+        vector = self._load_vector(key)
+        if vector is None:
+            if self._embeddings is None:
+                self._embeddings = OpenAIEmbeddings(model=self.model)
+
+            vector = np.asarray([await self._embeddings.aembed_query(text)], dtype="float32")
+            faiss.normalize_L2(vector)
+            self._store_vector(key, vector)
+        return vector
+
+    async def lookup(self, prompt: str, llm_key: str) -> Optional[Any]:
+        """Return the cached response for a semantically similar prompt, if any."""
+        entry = self._indexes.get(llm_key)
+        if entry is None or entry[0].ntotal == 0:
+            return None
+
+        index, responses = entry
+        vector = await self._embed(prompt)
+        similarities, ids = index.search(vector, 1)
+        if ids[0][0] < 0 or similarities[0][0] < self.threshold:
+            return None
+        return responses[ids[0][0]]
+
+    async def update(self, prompt: str, llm_key: str, response: Any) -> None:
+        """Store the response for a prompt under the given namespace."""
+        vector = await self._embed(prompt)
+
+        index, responses = self._indexes.get(llm_key) or (None, [])
+        if index is None or len(responses) >= self.max_entries:
+            # Flat indexes are cheap to rebuild; keep the newest half when full
+            responses = responses[len(responses) // 2:]
+            index = faiss.IndexFlatIP(vector.shape[1])
+            if responses:
+                index.add(self._stack_kept(llm_key, len(responses)))
+
+        index.add(vector)
+        responses.append(response)
+        self._indexes[llm_key] = (index, responses)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the persistent vector store on first use. Hold _db_lock."""
+        if self._db is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db = conn
+        return self._db
+
+    def _load_vector(self, key: bytes) -> Optional[np.ndarray]:
+        """Return a persisted normalized vector for the key, if stored."""
+        if self.db_path is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._connect().execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Embedding store read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype="float32").reshape(1, -1)
+
+    def _store_vector(self, key: bytes, vector: np.ndarray) -> None:
+        """Persist a normalized vector; failures only cost a future re-embed."""
+        if self.db_path is None:
+            return
+        try:
+            with self._db_lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, vector.tobytes()),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Embedding store write failed: %s", e)
+
+    def clear(self) -> None:
+        """Forget every stored response (embedded vectors stay reusable)."""
+        self._indexes.clear()
+
+    def _stack_kept(self, llm_key: str, keep: int) -> np.ndarray:
+        """Return the newest ``keep`` stored vectors of a namespace's index."""
+        old_index = self._indexes[llm_key][0]
+        vectors = old_index.reconstruct_n(0, old_index.ntotal)
+        return vectors[-keep:]
@@ -1,5 +1,5 @@
 import pytest
-from utils.normalize_md import normalize_markdown
+from utils.normalize_md import normalize_markdown, is_normalized
 
 
 def test_collapse_blank_lines():
@@ -87,4 +87,24 @@ def hello():
 More text"""
     result = normalize_markdown(dirty)
     assert "```python" in result
-    assert "```" in result 
\ No newline at end of file
+    assert "```" in result 
+
+def test_is_normalized_accepts_normalized_output():
+    """Test that normalized documents are recognized without renormalizing"""
+    text = normalize_markdown("# Title   \n\n\n\n## Characters\n\n**John Doe**\n* Item 1\n")
+    assert is_normalized(text)
+
+
+def test_is_normalized_rejects_changes():
+    """Test that text normalization would change is never reported as normalized"""
+    for dirty in ["Line1  \nLine2\n", "Line1\n\n\n\nLine2\n", "\nLine1\n", "Line1",
+                  "Line1\n\n", "*\nText\n", "* * Item\n", "a &amp; b\n", "<b>x</b>\n", "a\r\nb\n"]:
+        assert normalize_markdown(dirty) != dirty
+        assert not is_normalized(dirty)
+
+
+def test_fast_path_matches_full_normalization():
+    """Test that the already-clean fast path returns the same result"""
+    for text in ["# Title\n\n## Characters\n\n**John Doe**\n* Item 1\n", "Line1\n\n\n\nLine2",
+                 "* * Item\n", "a &amp; b\n", "Line1  \nLine2\n", "Line1\n"]:
+        assert normalize_markdown(text, fast_path=True) == normalize_markdown(text)
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the shared project-document connection at a throwaway database"""
+    main.close_db_connection()
+    monkeypatch.setattr(main, "DB_PATH", tmp_path / "writegeist.db")
+    monkeypatch.setitem(main._MARKDOWN_CACHE, "version", None)
+    monkeypatch.setitem(main._MARKDOWN_CACHE, "markdown", None)
+    yield
+    main.close_db_connection()
+
+
+def test_parallel_patches_all_survive(temp_db, monkeypatch):
+    """Concurrent patches to different sections must not overwrite each other"""
+    save = main.save_markdown_to_database
+
+    def slow_save(markdown):
+        # Give the other threads time to queue behind the lock holder
+        time.sleep(0.01)
+        save(markdown)
+
+    monkeypatch.setattr(main, "save_markdown_to_database", slow_save)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(
+            lambda i: main.apply_section_patch(f"Section {i}", f"- item {i}"),
+            range(60),
+        ))
+
+    document = main.load_markdown()
+    for i in range(60):
+        assert main.extract_section(document, f"Section {i}") == f"- item {i}"
+
+
+def test_patch_error_reaches_only_its_caller(temp_db, monkeypatch):
+    """A patch that fails to apply raises for its own request, not the batch"""
+    apply_patch = main.apply_patch_to_section
+
+    def failing_apply(markdown, section_name, new_content):
+        if section_name == "Broken":
+            raise RuntimeError("boom")
+        return apply_patch(markdown, section_name, new_content)
+
+    monkeypatch.setattr(main, "apply_patch_to_section", failing_apply)
+
+    def patch(section_name):
+        try:
+            main.apply_section_patch(section_name, f"- {section_name}")
+        except HTTPException as e:
+            return e
+        return None
+
+    names = ["Broken" if i % 5 == 0 else f"Section {i}" for i in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(patch, names))
+
+    for name, error in zip(names, results):
+        if name == "Broken":
+            assert error is not None and error.status_code == 500
+            assert "Broken" in error.detail["error"]
+        else:
+            assert error is None
+
+    document = main.load_markdown()
+    assert "## Broken" not in document
+    for name in names:
+        if name != "Broken":
+            assert main.extract_section(document, name) == f"- {name}"
@@ -0,0 +1,71 @@
+import pytest
+from main import apply_patch_to_section, extract_section, get_normalized_section
+
+
+DOC = "# Project\n\n## Characters\n\n- Alice\n- Bob\n\n## Setting\n\n- City\n"
+
+
+def test_extract_section_case_insensitive():
+    """Section names match their header regardless of case"""
+    assert extract_section(DOC, "characters") == "- Alice\n- Bob"
+    assert extract_section(DOC, "CHARACTERS") == "- Alice\n- Bob"
+
+
+def test_extract_section_no_casefold_equivalents():
+    """Matching is per-character case only, so ß does not match ss"""
+    assert extract_section("## Straße\n- x\n", "STRASSE") == ""
+
+
+def test_extract_missing_section():
+    """A section without a header extracts as empty"""
+    assert extract_section(DOC, "Plot") == ""
+
+
+def test_extract_last_section():
+    """The last section runs to the end of the document"""
+    assert extract_section(DOC, "Setting") == "- City"
+
+
+def test_extract_indented_header():
+    """Headers may be indented and carry trailing whitespace"""
+    doc = "## Ideas\n  ## Notes \n- n1\n\n## Other\nx"
+    assert extract_section(doc, "notes") == "- n1"
+
+
+def test_extract_drops_standalone_asterisk():
+    """A leading standalone '*' line (n8n artifact) is removed with the blank lines after it"""
+    assert extract_section("## A\n*\n\n- a\n", "a") == "- a"
+
+
+def test_patch_replaces_section_body():
+    """Patching replaces only the named section's body"""
+    assert apply_patch_to_section(DOC, "characters", "- Carol") == (
+        "# Project\n\n## Characters\n- Carol\n## Setting\n\n- City\n"
+    )
+
+
+def test_patch_last_section():
+    """Patching the last section replaces everything after its header"""
+    assert apply_patch_to_section(DOC, "Setting", "- Town") == (
+        "# Project\n\n## Characters\n\n- Alice\n- Bob\n\n## Setting\n- Town"
+    )
+
+
+def test_patch_indented_header():
+    """Patching keeps an indented header line as it was"""
+    doc = "## Ideas\n  ## Notes \n- n1\n\n## Other\nx"
+    assert apply_patch_to_section(doc, "Notes", "- n2") == "## Ideas\n  ## Notes \n- n2\n## Other\nx"
+
+
+@pytest.mark.parametrize("doc", ["## A\n- a\n", "## A\n- a"])
+def test_patch_missing_section_appends_header(doc):
+    """A missing section is appended as a new header after a blank line"""
+    assert apply_patch_to_section(doc, "B", "- b") == "## A\n- a\n\n## B\n\n- b"
+
+
+def test_get_normalized_section_repeat():
+    """Repeat lookups return the same normalized section, and a miss stays empty"""
+    doc = "## Notes\n\n\n\n- n1   \n\n## Other\nx"
+    assert get_normalized_section(doc, "notes") == "- n1\n"
+    assert get_normalized_section(doc, "notes") == "- n1\n"
+    assert get_normalized_section(doc, "missing") == ""
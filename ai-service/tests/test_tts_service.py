@@ -0,0 +1,126 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from tts_service import TTSService
+
+
+# chapter_audio as created by the frontend (src/db.ts), before the
+# content_hash migration; the service adds the column itself
+CHAPTER_AUDIO_SCHEMA = """
+    CREATE TABLE chapter_audio (
+        id TEXT PRIMARY KEY,
+        chapter_id TEXT NOT NULL,
+        audio_url TEXT,
+        duration INTEGER,
+        status TEXT DEFAULT 'pending',
+        created_at TEXT DEFAULT (datetime('now')),
+        updated_at TEXT DEFAULT (datetime('now'))
+    )
+"""
+
+
+@pytest.fixture
+def service(tmp_path):
+    """A TTSService on a temporary database and audio directory, with no API clients"""
+    db_path = tmp_path / "writegeist.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(CHAPTER_AUDIO_SCHEMA)
+    conn.close()
+
+    # Skip __init__: it points at the real project database and the AppData config
+    tts = TTSService.__new__(TTSService)
+    tts.db_path = db_path
+    tts.audio_dir = tmp_path / "audio"
+    tts.audio_dir.mkdir()
+    tts.config = {}
+    tts.openai_client = None
+    tts._http = None
+    tts.active_generations = set()
+    tts._generation_semaphore = asyncio.Semaphore(3)
+    tts._tls = threading.local()
+    tts._schema_ok = False
+    yield tts
+    conn = getattr(tts._tls, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def _fake_openai(calls):
+    """Stand-in for generate_audio_openai that returns distinct audio per call"""
+    async def generate(text, voice="alloy", model="tts-1"):
+        calls.append(text)
+        return [bytes([len(calls)]) * 2048], 7
+    return generate
+
+
+def _generate(tts, chapter_id, text):
+    """Create a record for the chapter and run generation to completion"""
+    audio_id = tts.create_audio_record(chapter_id)
+    result = asyncio.run(tts.process_chapter(chapter_id, audio_id, text))
+    assert result["success"], result
+    return result
+
+
+def _content_hash(tts, audio_id):
+    row = tts._conn().execute(
+        "SELECT content_hash FROM chapter_audio WHERE id = ?", (audio_id,)
+    ).fetchone()
+    return row[0]
+
+
+def test_create_audio_record_reuses_in_flight_record(service):
+    """Repeated generate requests share the chapter's pending record"""
+    first = service.create_audio_record("ch1")
+    assert service.create_audio_record("ch1") == first
+    assert service.create_audio_record("ch2") != first
+
+    count = service._conn().execute(
+        "SELECT COUNT(*) FROM chapter_audio WHERE chapter_id = 'ch1'"
+    ).fetchone()[0]
+    assert count == 1
+
+
+@pytest.mark.parametrize("final_status", ["completed", "error"])
+def test_create_audio_record_after_job_finishes(service, final_status):
+    """Once the job has finished, a new request gets a new record"""
+    first = service.create_audio_record("ch1")
+    service._update_audio_status(first, final_status)
+    assert service.create_audio_record("ch1") != first
+
+
+def test_identical_input_reuses_audio(service):
+    """Another chapter with the same text copies the earlier audio instead of calling the API"""
+    calls = []
+    service.generate_audio_openai = _fake_openai(calls)
+
+    first = _generate(service, "ch1", "Once upon a time.")
+    second = _generate(service, "ch2", "Once upon a time.")
+
+    assert calls == ["Once upon a time."]
+    assert second["duration"] == first["duration"] == 7
+    assert second["audio_url"] != first["audio_url"]
+    with open(first["audio_url"], "rb") as a, open(second["audio_url"], "rb") as b:
+        assert a.read() == b.read()
+    assert _content_hash(service, second["audio_id"]) == _content_hash(service, first["audio_id"])
+
+
+def test_overwritten_audio_is_not_reused(service):
+    """Regenerating a chapter forgets the hash of older records that pointed at its file"""
+    calls = []
+    service.generate_audio_openai = _fake_openai(calls)
+
+    _generate(service, "ch1", "Original text.")
+    old = _generate(service, "ch2", "Original text.")
+    new = _generate(service, "ch2", "Edited text.")
+    assert calls == ["Original text.", "Edited text."]
+    assert old["audio_url"] == new["audio_url"]
+    assert _content_hash(service, old["audio_id"]) is None
+
+    # The original text still maps to ch1's untouched file, not ch2's new audio
+    reused = _generate(service, "ch3", "Original text.")
+    assert len(calls) == 2
+    with open(reused["audio_url"], "rb") as f:
+        assert f.read() == bytes([1]) * 2048
@@ -1,82 +1,226 @@
 import os
 import time
+import hashlib
+import shutil
 import asyncio
+import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 import sqlite3
+import threading
 import uuid
-from openai import OpenAI
-import requests
+from openai import AsyncOpenAI
+import httpx
 import json
 
+logger = logging.getLogger(__name__)
+
+# Ids per DELETE ... IN (...), well under SQLite's bound-parameter limit
+_DELETE_CHUNK_SIZE = 500
+
+# Seconds a free disk space measurement is reused
+_DISK_FREE_TTL = 5.0
+
+# Concurrent OpenAI TTS requests per chapter
+_TTS_CONCURRENCY = 5
+
+# Hot statements as module constants so each connection's statement cache
+# sees identical SQL text and prepares them only once
+_UPDATE_STATUS_WITH_AUDIO_SQL = """
+    UPDATE chapter_audio
+    SET status = ?, audio_url = ?, duration = ?, content_hash = ?, updated_at = datetime('now')
+    WHERE id = ?
+"""
+# A new file at audio_url replaces what older records with that url point at
+_FORGET_REPLACED_AUDIO_SQL = """
+    UPDATE chapter_audio
+    SET content_hash = NULL
+    WHERE audio_url = ? AND id != ?
+"""
+_SELECT_AUDIO_BY_HASH_SQL = """
+    SELECT audio_url, duration
+    FROM chapter_audio
+    WHERE content_hash = ? AND status = 'completed'
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+_UPDATE_STATUS_SQL = """
+    UPDATE chapter_audio
+    SET status = ?, updated_at = datetime('now')
+    WHERE id = ?
+"""
+_SELECT_CHAPTER_TEXT_SQL = "SELECT text FROM chapters WHERE id = ?"
+_INSERT_AUDIO_SQL = """
+    INSERT INTO chapter_audio (id, chapter_id, status, created_at, updated_at)
+    VALUES (?, ?, 'pending', datetime('now'), datetime('now'))
+"""
+_SELECT_IN_FLIGHT_AUDIO_SQL = """
+    SELECT id
+    FROM chapter_audio
+    WHERE chapter_id = ? AND status IN ('pending', 'processing')
+    LIMIT 1
+"""
+_SELECT_AUDIO_STATUS_SQL = """
+    SELECT id, audio_url, duration, status, created_at, updated_at
+    FROM chapter_audio
+    WHERE chapter_id = ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+# Per-connection settings; WAL itself persists in the file (see __init__)
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+
 class TTSService:
     def __init__(self):
         self.openai_client = None
+        # Reused async HTTP client for ElevenLabs, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
         # Use the database in the project directory (parent of ai-service)
         self.db_path = Path(__file__).parent.parent / "writegeist.db"
         self.audio_dir = Path.home() / "AppData" / "Roaming" / "Writegeist" / "audio"
         self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self._config_path = Path.home() / "AppData" / "Roaming" / "Writegeist" / "config.json"
+        # st_mtime_ns of the parsed config.json, None when it wasn't found
+        self._config_mtime: Optional[int] = None
         self.config = self._load_config()
         self._init_clients()
         # Track chapters currently being processed to prevent concurrent generation
         self.active_generations = set()
+        # (monotonic time, free bytes) of the last disk space check
+        self._disk_free = (float('-inf'), 0)
+        # Bound concurrent generations (each already fans out per chunk)
+        self._generation_semaphore = asyncio.Semaphore(int(os.getenv('TTS_CONCURRENCY', '3')))
+        # One reused connection per thread (threadpool workers, event loop)
+        self._tls = threading.local()
+        # Set once chapter_audio is seen; the frontend may create it later
+        self._schema_ok = False
+        # journal_mode is stored in the database file, so switch it once here;
+        # the frontend creates the file, so don't create an empty one
+        if self.db_path.exists():
+            try:
+                conn = self._connect()
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Could not enable WAL on %s: %s", self.db_path, e)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a database connection with the per-connection pragmas applied"""
+        conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None,
+                               cached_statements=512)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's cached connection, opening it on first use"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._tls.conn = conn
+        return conn
+    
+    def _has_audio_table(self, conn: sqlite3.Connection) -> bool:
+        """Check for chapter_audio, querying sqlite_master only until it exists"""
+        if not self._schema_ok:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='chapter_audio'"
+            ).fetchone()
+            if row is not None:
+                self._ensure_audio_schema(conn)
+            self._schema_ok = row is not None
+        return self._schema_ok
+    
+    @staticmethod
+    def _ensure_audio_schema(conn: sqlite3.Connection):
+        """Add the column and index the service relies on to chapter_audio"""
+        # Lets cleanup skip the newest completed rows by index order
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_audio_status_created ON chapter_audio(status, created_at DESC)"
+        )
+        # Lets the status poll read a chapter's latest record with one seek
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chapter_audio_lookup ON chapter_audio(chapter_id, created_at DESC)"
+        )
+        # content_hash, in case the frontend hasn't migrated yet
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(chapter_audio)")}
+        if 'content_hash' not in columns:
+            try:
+                conn.execute("ALTER TABLE chapter_audio ADD COLUMN content_hash TEXT")
+            except sqlite3.OperationalError as e:
+                # Another connection may have added it first
+                if 'duplicate column' not in str(e):
+                    raise
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from AppData"""
-        config_path = Path.home() / "AppData" / "Roaming" / "Writegeist" / "config.json"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                # print(f"Loaded TTS config from {config_path}")  # Verbose: commented out
-                return config
-        else:
-            print(f"No config file found at {config_path}")
-        return {}
+        """Load configuration from AppData, reusing the parsed file while it is unchanged"""
+        config_path = self._config_path
+        try:
+            mtime = config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            logger.info("No config file found at %s", config_path)
+            self._config_mtime = None
+            return {}
+        if mtime == self._config_mtime:
+            return self.config
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+            logger.debug("Loaded TTS config from %s", config_path)
+        self._config_mtime = mtime
+        return config
     
     def _init_clients(self):
         """Initialize TTS API clients based on configuration"""
         if self.config.get('OPENAI_API_KEY'):
-            self.openai_client = OpenAI(api_key=self.config['OPENAI_API_KEY'])
+            self.openai_client = AsyncOpenAI(api_key=self.config['OPENAI_API_KEY'])
     
-    def _update_audio_status(self, audio_id: str, status: str, audio_url: Optional[str] = None, duration: Optional[int] = None):
+    def _update_audio_status(self, audio_id: str, status: str, audio_url: Optional[str] = None, duration: Optional[int] = None,
+                             content_hash: Optional[str] = None):
         """Update audio record in database"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10.0)
+            conn = self._conn()
             cursor = conn.cursor()
             
             if audio_url and duration is not None:
-                cursor.execute("""
-                    UPDATE chapter_audio 
-                    SET status = ?, audio_url = ?, duration = ?, updated_at = datetime('now')
-                    WHERE id = ?
-                """, (status, audio_url, duration, audio_id))
+                cursor.execute(_FORGET_REPLACED_AUDIO_SQL, (audio_url, audio_id))
+                cursor.execute(_UPDATE_STATUS_WITH_AUDIO_SQL, (status, audio_url, duration, content_hash, audio_id))
             else:
-                cursor.execute("""
-                    UPDATE chapter_audio 
-                    SET status = ?, updated_at = datetime('now')
-                    WHERE id = ?
-                """, (status, audio_id))
-            
-            conn.commit()
-            conn.close()
+                cursor.execute(_UPDATE_STATUS_SQL, (status, audio_id))
         except Exception as e:
-            print(f"Error updating audio status for {audio_id}: {e}")
+            logger.error("Error updating audio status for %s: %s", audio_id, e)
             raise
     
     def _get_chapter_text(self, chapter_id: str) -> Optional[str]:
         """Get chapter text from database"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10.0)
+            conn = self._conn()
             cursor = conn.cursor()
             
-            cursor.execute("SELECT text FROM chapters WHERE id = ?", (chapter_id,))
+            cursor.execute(_SELECT_CHAPTER_TEXT_SQL, (chapter_id,))
             result = cursor.fetchone()
             
-            conn.close()
             return result[0] if result else None
         except Exception as e:
-            print(f"Error getting chapter text for {chapter_id}: {e}")
+            logger.error("Error getting chapter text for %s: %s", chapter_id, e)
+            return None
+    
+    def _find_cached_audio(self, content_hash: str) -> Optional[tuple[Path, int]]:
+        """Return (path, duration) of existing audio generated from the same input"""
+        try:
+            row = self._conn().execute(_SELECT_AUDIO_BY_HASH_SQL, (content_hash,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Audio cache lookup failed: %s", e)
+            return None
+        if row is None or not row[0] or row[1] is None:
+            return None
+        audio_path = Path(row[0])
+        if not audio_path.exists() or audio_path.stat().st_size < 1024:
             return None
+        return audio_path, row[1]
     
     def _estimate_duration(self, text: str) -> int:
         """Estimate audio duration in seconds based on text length"""
@@ -85,40 +229,46 @@ class TTSService:
         minutes = words / 150
         return int(minutes * 60)
     
-    async def generate_audio_openai(self, text: str, voice: str = "alloy", model: str = "tts-1") -> tuple[bytes, int]:
-        """Generate audio using OpenAI TTS"""
+    async def generate_audio_openai(self, text: str, voice: str = "alloy", model: str = "tts-1") -> tuple[list[bytes], int]:
+        """Generate audio using OpenAI TTS, returned as in-order MP3 chunks"""
         if not self.openai_client:
             # Try to reinitialize if config wasn't available initially
-            self.config = self._load_config()
-            self._init_clients()
+            # (only re-parsed if config.json changed since the last load)
+            config = self._load_config()
+            if config is not self.config:
+                self.config = config
+                self._init_clients()
             if not self.openai_client:
                 raise ValueError("OpenAI API key not configured - please check settings")
         
         # OpenAI TTS has a 4096 character limit per request
-        chunks = []
         chunk_size = 4000  # Leave some buffer
         
-        print(f"Generating audio with OpenAI TTS - model: {model}, voice: {voice}, text length: {len(text)}")
+        logger.info("Generating audio with OpenAI TTS - model: %s, voice: %s, text length: %d", model, voice, len(text))
         
-        for i in range(0, len(text), chunk_size):
-            chunk_text = text[i:i + chunk_size]
-            
-            response = self.openai_client.audio.speech.create(
+        # Request all chunks concurrently (bounded to stay within rate limits);
+        # gather keeps results in chunk order
+        semaphore = asyncio.Semaphore(_TTS_CONCURRENCY)
+        chunks = await asyncio.gather(*(
+            self._tts_chunk(text[i:i + chunk_size], semaphore, model, voice)
+            for i in range(0, len(text), chunk_size)
+        ))
+        duration = self._estimate_duration(text)
+        
+        logger.info("Generated audio successfully - size: %d bytes, estimated duration: %ss", sum(map(len, chunks)), duration)
+        return chunks, duration
+    
+    async def _tts_chunk(self, chunk_text: str, semaphore: asyncio.Semaphore, model: str, voice: str) -> bytes:
+        """Generate audio for one chunk of text with OpenAI TTS"""
+        async with semaphore:
+            response = await self.openai_client.audio.speech.create(
                 model=model,
                 voice=voice,
                 input=chunk_text
             )
-            
-            chunks.append(response.content)
-        
-        # Concatenate all audio chunks
-        full_audio = b''.join(chunks)
-        duration = self._estimate_duration(text)
-        
-        print(f"Generated audio successfully - size: {len(full_audio)} bytes, estimated duration: {duration}s")
-        return full_audio, duration
+        return response.content
     
-    async def generate_audio_elevenlabs(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> tuple[bytes, int]:
+    async def generate_audio_elevenlabs(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> tuple[list[bytes], int]:
         """Generate audio using ElevenLabs API"""
         api_key = self.config.get('ELEVENLABS_API_KEY')
         if not api_key:
@@ -141,92 +291,148 @@ class TTSService:
             }
         }
         
-        response = requests.post(url, json=data, headers=headers)
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=120.0)
+        
+        response = await self._http.post(url, json=data, headers=headers)
         response.raise_for_status()
         
         duration = self._estimate_duration(text)
-        return response.content, duration
+        return [response.content], duration
     
-    async def process_chapter(self, chapter_id: str, audio_id: str) -> Dict[str, Any]:
-        """Process a single chapter to generate audio"""
-        # Check if already processing this chapter
-        if chapter_id in self.active_generations:
-            raise ValueError(f"Chapter {chapter_id} is already being processed")
-        
-        try:
-            # Mark as active
-            self.active_generations.add(chapter_id)
-            
-            # Update status to processing
-            self._update_audio_status(audio_id, "processing")
-            
-            # Get chapter text
-            text = self._get_chapter_text(chapter_id)
-            if not text:
-                raise ValueError(f"Chapter {chapter_id} not found")
-            
-            # Validate text content
-            text = text.strip()
-            if len(text) < 10:
-                raise ValueError(f"Chapter {chapter_id} has insufficient text for audio generation")
-            
-            # Check available disk space (basic check)
-            import shutil
+    async def aclose(self):
+        """Close the HTTP clients (called on API shutdown)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self.openai_client is not None:
+            await self.openai_client.close()
+    
+    def _free_disk_space(self) -> int:
+        """Free bytes in the audio directory, re-measured at most every few seconds"""
+        now = time.monotonic()
+        checked_at, free_space = self._disk_free
+        if now - checked_at >= _DISK_FREE_TTL:
             free_space = shutil.disk_usage(self.audio_dir).free
-            if free_space < 100 * 1024 * 1024:  # Less than 100MB
-                raise ValueError("Insufficient disk space for audio generation")
-            
-            # Generate audio based on provider
-            provider = self.config.get('TTS_PROVIDER', 'openai')
-            voice = self.config.get('TTS_VOICE', 'alloy')
-            model = self.config.get('TTS_MODEL', 'tts-1')
-            
-            print(f"Processing audio with provider: {provider}, voice: {voice}, model: {model}")
-            
-            if provider == 'openai':
-                audio_data, duration = await self.generate_audio_openai(text, voice, model)
-            elif provider == 'elevenlabs':
-                audio_data, duration = await self.generate_audio_elevenlabs(text)
-            else:
-                raise ValueError(f"Unknown TTS provider: {provider}")
-            
-            # Save audio file
-            audio_filename = f"{chapter_id}.mp3"
-            audio_path = self.audio_dir / audio_filename
-            
-            # Validate audio data before saving
-            if not audio_data or len(audio_data) < 1024:  # Less than 1KB likely corrupted
-                raise ValueError(f"Generated audio data appears to be corrupted or empty (size: {len(audio_data) if audio_data else 0} bytes)")
-            
-            with open(audio_path, 'wb') as f:
-                f.write(audio_data)
-                f.flush()  # Ensure data is written to disk
-                os.fsync(f.fileno())  # Force write to disk
-            
-            # Verify file was written correctly
-            if not audio_path.exists():
-                raise ValueError("Audio file was not created")
-            
-            actual_size = audio_path.stat().st_size
-            if actual_size < 1024:
-                raise ValueError(f"Audio file is too small (size: {actual_size} bytes)")
-            
-            if actual_size != len(audio_data):
-                raise ValueError(f"Audio file size mismatch (expected: {len(audio_data)}, actual: {actual_size})")
-            
-            # Update database with success
-            self._update_audio_status(audio_id, "completed", str(audio_path), duration)
-            
+            self._disk_free = (now, free_space)
+        return free_space
+    
+    def preflight(self, chapter_id: str) -> str:
+        """Validate a chapter for generation and return its text (blocking: run off the event loop)"""
+        # Get chapter text
+        text = self._get_chapter_text(chapter_id)
+        if not text:
+            raise ValueError(f"Chapter {chapter_id} not found")
+        
+        # Validate text content
+        text = text.strip()
+        if len(text) < 10:
+            raise ValueError(f"Chapter {chapter_id} has insufficient text for audio generation")
+        
+        # Check available disk space (basic check)
+        if self._free_disk_space() < 100 * 1024 * 1024:  # Less than 100MB
+            raise ValueError("Insufficient disk space for audio generation")
+        
+        return text
+    
+    async def process_chapter(self, chapter_id: str, audio_id: str, text: Optional[str] = None) -> Dict[str, Any]:
+        """Process a single chapter to generate audio
+        
+        text is the chapter text returned by preflight(); without it the
+        checks run here, in a worker thread.
+        """
+        # Check if already processing this chapter; repeated generate requests
+        # share the in-flight record, so this is the same job scheduled twice
+        if chapter_id in self.active_generations:
+            logger.info("Chapter %s is already being processed", chapter_id)
             return {
-                "success": True,
+                "success": False,
                 "audio_id": audio_id,
-                "audio_url": str(audio_path),
-                "duration": duration
+                "error": "Audio generation already in progress"
             }
+        
+        try:
+            # Mark as active; get_audio_status reports the pending record as
+            # processing from this set, so only the final state is written
+            self.active_generations.add(chapter_id)
             
+            # Wait for a generation slot; requests beyond the limit queue here
+            async with self._generation_semaphore:
+                if text is None:
+                    text = await asyncio.to_thread(self.preflight, chapter_id)
+                
+                # Generate audio based on provider
+                provider = self.config.get('TTS_PROVIDER', 'openai')
+                voice = self.config.get('TTS_VOICE', 'alloy')
+                model = self.config.get('TTS_MODEL', 'tts-1')
+                
+                logger.info("Processing audio with provider: %s, voice: %s, model: %s", provider, voice, model)
+                
+                # Save audio file
+                audio_filename = f"{chapter_id}.mp3"
+                audio_path = self.audio_dir / audio_filename
+                
+                # Identical input produces identical audio, so reuse an earlier file
+                content_hash = hashlib.sha256(f"{provider}|{model}|{voice}|{text}".encode()).hexdigest()
+                cached = await asyncio.to_thread(self._find_cached_audio, content_hash)
+                if cached:
+                    cached_path, duration = cached
+                    if cached_path != audio_path:
+                        # Copy rather than hardlink: the file is rewritten in place
+                        # on regeneration, which would change every link
+                        await asyncio.to_thread(shutil.copyfile, cached_path, audio_path)
+                    logger.info("Reusing cached audio %s for chapter %s", cached_path, chapter_id)
+                    self._update_audio_status(audio_id, "completed", str(audio_path), duration, content_hash)
+                    return {
+                        "success": True,
+                        "audio_id": audio_id,
+                        "audio_url": str(audio_path),
+                        "duration": duration
+                    }
+                
+                if provider == 'openai':
+                    audio_chunks, duration = await self.generate_audio_openai(text, voice, model)
+                elif provider == 'elevenlabs':
+                    audio_chunks, duration = await self.generate_audio_elevenlabs(text)
+                else:
+                    raise ValueError(f"Unknown TTS provider: {provider}")
+                
+                # Validate audio data before saving
+                audio_size = sum(map(len, audio_chunks))
+                if audio_size < 1024:  # Less than 1KB likely corrupted
+                    raise ValueError(f"Generated audio data appears to be corrupted or empty (size: {audio_size} bytes)")
+                
+                with open(audio_path, 'wb') as f:
+                    # Write the chunks in order rather than joining them into one
+                    # more copy of the whole file in memory
+                    f.writelines(audio_chunks)
+                # No fsync: the MP3 can always be regenerated from the chapter
+                # text, so durability isn't worth a disk cache flush
+                
+                # Verify file was written correctly
+                if not audio_path.exists():
+                    raise ValueError("Audio file was not created")
+                
+                actual_size = audio_path.stat().st_size
+                if actual_size < 1024:
+                    raise ValueError(f"Audio file is too small (size: {actual_size} bytes)")
+                
+                if actual_size != audio_size:
+                    raise ValueError(f"Audio file size mismatch (expected: {audio_size}, actual: {actual_size})")
+                
+                # Update database with success
+                self._update_audio_status(audio_id, "completed", str(audio_path), duration, content_hash)
+                
+                return {
+                    "success": True,
+                    "audio_id": audio_id,
+                    "audio_url": str(audio_path),
+                    "duration": duration
+                }
+                
         except Exception as e:
             # Update status to error
-            print(f"[ERROR] Audio processing failed for {audio_id}: {str(e)}")
+            logger.error("Audio processing failed for %s: %s", audio_id, e)
             self._update_audio_status(audio_id, "error")
             return {
                 "success": False,
@@ -238,117 +444,141 @@ class TTSService:
             self.active_generations.discard(chapter_id)
     
     def create_audio_record(self, chapter_id: str) -> str:
-        """Create a new audio record in the database"""
+        """Create a new audio record, or return the chapter's in-flight one"""
         try:
             if not self.db_path.exists():
-                print(f"[ERROR] Database not found at {self.db_path}")
+                logger.error("Database not found at %s", self.db_path)
                 raise ValueError("Database not accessible")
                 
             audio_id = str(uuid.uuid4())
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             cursor = conn.cursor()
             
             # Check if chapter_audio table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chapter_audio'")
-            if not cursor.fetchone():
+            if not self._has_audio_table(conn):
                 raise ValueError("chapter_audio table does not exist - database may not be initialized")
             
-            cursor.execute("""
-                INSERT INTO chapter_audio (id, chapter_id, status, created_at, updated_at)
-                VALUES (?, ?, 'pending', datetime('now'), datetime('now'))
-            """, (audio_id, chapter_id))
+            # Check and insert under one write lock so two requests can't
+            # both create a job for the chapter
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                existing = cursor.execute(_SELECT_IN_FLIGHT_AUDIO_SQL, (chapter_id,)).fetchone()
+                if existing is None:
+                    cursor.execute(_INSERT_AUDIO_SQL, (audio_id, chapter_id))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
             
-            conn.commit()
-            conn.close()
+            if existing is not None:
+                logger.info("Reusing in-flight audio record %s for chapter %s", existing[0], chapter_id)
+                return existing[0]
             
-            print(f"Created audio record {audio_id} for chapter {chapter_id}")
+            logger.info("Created audio record %s for chapter %s", audio_id, chapter_id)
             return audio_id
         except Exception as e:
-            print(f"Error creating audio record for chapter {chapter_id}: {e}")
+            logger.error("Error creating audio record for chapter %s: %s", chapter_id, e)
             raise
     
     def get_audio_status(self, chapter_id: str) -> Optional[Dict[str, Any]]:
         """Get audio status for a chapter"""
         try:
             if not self.db_path.exists():
-                print(f"Database not found at {self.db_path}")
+                logger.warning("Database not found at %s", self.db_path)
                 return None
                 
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn()
             cursor = conn.cursor()
             
             # Check if chapter_audio table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chapter_audio'")
-            if not cursor.fetchone():
-                print("chapter_audio table does not exist")
-                conn.close()
+            if not self._has_audio_table(conn):
+                logger.warning("chapter_audio table does not exist")
                 return None
             
-            cursor.execute("""
-                SELECT id, audio_url, duration, status, created_at, updated_at
-                FROM chapter_audio
-                WHERE chapter_id = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, (chapter_id,))
+            cursor.execute(_SELECT_AUDIO_STATUS_SQL, (chapter_id,))
             
             result = cursor.fetchone()
-            conn.close()
             
             if result:
                 audio_data = {
                     "id": result[0],
                     "audio_url": result[1],
                     "duration": result[2],
-                    "status": result[3],
+                    "status": "processing" if result[3] == "pending" and chapter_id in self.active_generations else result[3],
                     "created_at": result[4],
                     "updated_at": result[5]
                 }
-                # print(f"Audio status for chapter {chapter_id}: {audio_data}")  # Verbose: commented out
+                logger.debug("Audio status for chapter %s: %s", chapter_id, audio_data)
                 return audio_data
             else:
-                # print(f"No audio found for chapter {chapter_id}")  # Verbose: commented out
+                logger.debug("No audio found for chapter %s", chapter_id)
                 return None
         except Exception as e:
-            print(f"Error getting audio status for chapter {chapter_id}: {e}")
+            logger.error("Error getting audio status for chapter %s: %s", chapter_id, e)
             return None
     
+    def delete_audio_records(self, chapter_id: str) -> int:
+        """Delete every audio record of a chapter, returning how many were removed"""
+        cursor = self._conn().execute("DELETE FROM chapter_audio WHERE chapter_id = ?", (chapter_id,))
+        return cursor.rowcount
+    
     def cleanup_old_audio_files(self, keep_count: int = 100):
         """Clean up old audio files to save space"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
         
-        # Get all audio records sorted by creation date
-        cursor.execute("""
-            SELECT id, audio_url
-            FROM chapter_audio
-            WHERE status = 'completed'
-            ORDER BY created_at DESC
-        """)
-        
-        results = cursor.fetchall()
-        
-        # Delete files and records beyond keep_count
-        cleaned_count = 0
-        for i, (audio_id, audio_url) in enumerate(results):
-            if i >= keep_count and audio_url:
-                try:
-                    # Delete file
-                    audio_path = Path(audio_url)
-                    if audio_path.exists():
-                        audio_path.unlink()
-                        print(f"Deleted audio file: {audio_path}")
-                    
-                    # Delete record
-                    cursor.execute("DELETE FROM chapter_audio WHERE id = ?", (audio_id,))
-                    cleaned_count += 1
-                except Exception as e:
-                    print(f"Error cleaning up audio {audio_id}: {e}")
+        try:
+            # Hold the write lock across select, unlinks and delete so the
+            # rows we remove are exactly the ones whose files we removed
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            if not self._has_audio_table(conn):
+                conn.rollback()
+                return 0
+            
+            # Only the completed records beyond keep_count, newest first
+            cursor.execute("""
+                SELECT id, audio_url
+                FROM chapter_audio
+                WHERE status = 'completed'
+                ORDER BY created_at DESC
+                LIMIT -1 OFFSET ?
+            """, (keep_count,))
+            
+            stale = [(audio_id, audio_url) for audio_id, audio_url in cursor.fetchall() if audio_url]
+            
+            ids_to_delete = [record[0] for record in stale if self._delete_audio_file(record)]
+            
+            for start in range(0, len(ids_to_delete), _DELETE_CHUNK_SIZE):
+                chunk = ids_to_delete[start:start + _DELETE_CHUNK_SIZE]
+                cursor.execute(
+                    f"DELETE FROM chapter_audio WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            
+            conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
         
+        cleaned_count = len(ids_to_delete)
         if cleaned_count > 0:
-            print(f"Cleaned up {cleaned_count} old audio files")
-        
-        conn.commit()
-        conn.close()
-        return cleaned_count
\ No newline at end of file
+            logger.info("Cleaned up %d old audio files", cleaned_count)
+        return cleaned_count
+    
+    @staticmethod
+    def _delete_audio_file(record: tuple[str, str]) -> bool:
+        """Delete one audio file; False if its record should be kept"""
+        audio_id, audio_url = record
+        try:
+            audio_path = Path(audio_url)
+            # Records can share a path, so a file already gone counts as deleted
+            if audio_path.exists():
+                audio_path.unlink(missing_ok=True)
+                logger.info("Deleted audio file: %s", audio_path)
+            return True
+        except Exception as e:
+            logger.error("Error cleaning up audio %s: %s", audio_id, e)
+            return False
@@ -1,5 +1,32 @@
 import re
 
+# Compiled once at import instead of looked up in re's cache on every call
+_LI_BREAK_RE = re.compile(r'</li><li>')
+_UL_TAG_RE = re.compile(r'</?ul>')
+_OL_TAG_RE = re.compile(r'</?ol>')
+_LI_OPEN_RE = re.compile(r'<li[^>]*>')
+_LI_CLOSE_RE = re.compile(r'</li>')
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+# The entities decoded, in one scan. Decoding used to be a replace chain in
+# which '&amp;' ran before quot/#39/nbsp, so '&amp;quot;' etc. fully decode
+_HTML_ENTITY_RE = re.compile(r'&(?:lt;|gt;|amp;(?:quot;|#39;|nbsp;)?|quot;|#39;|nbsp;)')
+_HTML_ENTITIES = {
+    '&lt;': '<', '&gt;': '>', '&amp;': '&', '&quot;': '"', '&#39;': "'", '&nbsp;': ' ',
+    '&amp;quot;': '"', '&amp;#39;': "'", '&amp;nbsp;': ' ',
+}
+_TRAILING_WS_RE = re.compile(r'[ \t]+$', re.MULTILINE)
+# Per-line bullet cleanup as whole-text scans ([^\S\n] is \s within one line);
+# the newline rule may leave one trailing '\n', which the final rstrip removes
+_STAR_ONLY_LINE_RE = re.compile(r'^[^\S\n]*\*[^\S\n]*(?:\n|\Z)', re.MULTILINE)
+_DOUBLE_BULLET_RE = re.compile(r'^[^\S\n]*\*[^\S\n]*\*[^\S\n]+', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+# Patterns that make normalize_markdown change its input: a standalone '*'
+# line or a "* *" bullet (first line, then any later line), and a blank run
+_ASTERISK_FIRST_RE = re.compile(r'[^\S\n]*\*[^\S\n]*(?:\n|\*[^\S\n])')
+_ASTERISK_LINE_RE = re.compile(r'\n[^\S\n]*\*[^\S\n]*(?:\n|\*[^\S\n])')
+_BLANK_RUN_RE = re.compile(r'\n\s*\n\s*\n\s*\n+')
+
+
 def clean_html_artifacts(text: str) -> str:
     """
     Remove HTML artifacts that might be mixed into markdown content.
@@ -7,28 +34,26 @@ def clean_html_artifacts(text: str) -> str:
     if not text:
         return ""
     
-    # Remove HTML list artifacts that commonly get mixed in
-    text = re.sub(r'</li><li>', '\n* ', text)
-    text = re.sub(r'</?ul>', '', text)
-    text = re.sub(r'</?ol>', '', text)
-    text = re.sub(r'<li[^>]*>', '* ', text)
-    text = re.sub(r'</li>', '', text)
-    
-    # Remove any remaining HTML tags
-    text = re.sub(r'<[^>]*>', '', text)
+    # Every tag pattern starts with '<', so plain text skips all the passes
+    if '<' in text:
+        # Remove HTML list artifacts that commonly get mixed in
+        text = _LI_BREAK_RE.sub('\n* ', text)
+        text = _UL_TAG_RE.sub('', text)
+        text = _OL_TAG_RE.sub('', text)
+        text = _LI_OPEN_RE.sub('* ', text)
+        text = _LI_CLOSE_RE.sub('', text)
+        
+        # Remove any remaining HTML tags
+        text = _HTML_TAG_RE.sub('', text)
     
     # Decode HTML entities
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&quot;', '"')
-    text = text.replace('&#39;', "'")
-    text = text.replace('&nbsp;', ' ')
+    if '&' in text:
+        text = _HTML_ENTITY_RE.sub(lambda m: _HTML_ENTITIES[m.group()], text)
     
     return text
 
 
-def normalize_markdown(text: str) -> str:
+def normalize_markdown(text: str, fast_path: bool = False) -> str:
     """
     Normalize markdown text by:
     - Cleaning HTML artifacts
@@ -36,42 +61,38 @@ def normalize_markdown(text: str) -> str:
     - Removing trailing whitespace from lines
     - Ensuring consistent spacing
     - Cleaning up malformed bullet points
+    
+    With fast_path, text that is_normalized() proves clean is returned as-is
+    (same result, one scan instead of the full rewrite pipeline).
     """
     if not text:
         return ""
     
+    if fast_path and is_normalized(text):
+        return text
+    
     # Clean HTML artifacts first
     text = clean_html_artifacts(text)
     
-    # Convert Windows line endings to Unix
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    # Convert Windows line endings to Unix (one memchr scan for LF-only text)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
     
     # Remove trailing whitespace from each line
-    text = re.sub(r'[ \t]+$', '', text, flags=re.MULTILINE)
+    text = _TRAILING_WS_RE.sub('', text)
     
     # Clean up malformed bullet points
-    # Remove standalone asterisks that aren't part of proper bullet points
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for i, line in enumerate(lines):
-        # Skip standalone asterisks (lines with only * and optional whitespace)
-        if line.strip() == '*':
-            continue
+    if '*' in text:
+        # Remove standalone asterisks (lines with only * and optional whitespace)
+        text = _STAR_ONLY_LINE_RE.sub('', text)
         
-        # Fix bullet points that start with multiple asterisks
-        if re.match(r'^\s*\*\s*\*\s+', line):
-            # Convert "* * content" to "* content"
-            line = re.sub(r'^\s*\*\s*\*\s+', '* ', line)
-        
-        cleaned_lines.append(line)
-    
-    text = '\n'.join(cleaned_lines)
+        # Convert "* * content" to "* content"
+        text = _DOUBLE_BULLET_RE.sub('* ', text)
     
     # Collapse 3+ consecutive blank lines to 2 blank lines
     # This handles multiple patterns of blank lines
-    text = re.sub(r'\n\s*\n\s*\n\s*\n+', '\n\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_RUN_RE.sub('\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
     # Remove any leading blank lines
     text = text.lstrip('\n')
@@ -79,4 +100,23 @@ def normalize_markdown(text: str) -> str:
     # Ensure file ends with exactly one newline
     text = text.rstrip() + '\n'
     
-    return text 
\ No newline at end of file
+    return text 
+
+
+def is_normalized(text: str) -> bool:
+    """
+    Return True if normalize_markdown(text) would return text unchanged.
+    The checks are C-level substring and regex scans, much cheaper than
+    normalizing. May return False for some already-normalized text (e.g. any
+    '<' or '&'), never True for text that normalization would change.
+    """
+    if not text.endswith('\n') or text.startswith('\n') or len(text) < 2 or text[-2].isspace():
+        return False
+    if '<' in text or '&' in text or '\r' in text or '\n\n\n' in text:
+        return False
+    # Trailing spaces/tabs; the final line was checked above
+    if ' \n' in text or '\t\n' in text or _BLANK_RUN_RE.search(text):
+        return False
+    if '*' in text and (_ASTERISK_FIRST_RE.match(text) or _ASTERISK_LINE_RE.search(text)):
+        return False
+    return True
@@ -3,10 +3,15 @@ BULLETPROOF Story Chat - Simple keyword search with FULL chapter context.
 No FTS, no embeddings, no crashes. Just works.
 """
 
+import heapq
+import logging
 import sqlite3
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ChapterChunk:
@@ -33,52 +38,110 @@ class VectorSearchService:
     def __init__(self, db_path: str):
         """Initialize the bulletproof search service."""
         self.db_path = db_path
-        print("[STORY CHAT] Using bulletproof keyword search with full chapter context!")
-        print("[STORY CHAT] No FTS, no embeddings, no crashes - just works!")
+        # One connection shared by the threadpool workers, opened on first use
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+        # Last _get_all_chapters result and the connection's data version it was read at
+        self._chapters_cache: Optional[List[tuple]] = None
+        self._chapters_version: Optional[tuple] = None
+        # chapter_id -> (title, text, title.lower(), (title + " " + text).lower())
+        self._lowercase_cache: Dict[str, Tuple[str, str, str, str]] = {}
+        logger.debug("[STORY CHAT] Using bulletproof keyword search with full chapter context!")
+        logger.debug("[STORY CHAT] No FTS, no embeddings, no crashes - just works!")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get or open the shared connection. Hold _conn_lock while using it."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        """Close the shared connection if it was opened."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                # data_version is per connection, so a new one starts over
+                self._chapters_cache = None
     
     def _get_all_chapters(self) -> List[tuple]:
         """Get all chapters from database with bulletproof error handling."""
         try:
-            with sqlite3.connect(self.db_path, timeout=10) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+            with self._conn_lock:
+                conn = self._connection()
+                # data_version moves when another connection (the frontend)
+                # commits, total_changes when this one writes; unlike MAX(created_at)
+                # this also catches chapter edits
+                version = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+                if self._chapters_cache is not None and version == self._chapters_version:
+                    return self._chapters_cache
+                cursor = conn.execute("""
                     SELECT id, title, text, created_at 
                     FROM chapters 
                     ORDER BY created_at
                 """)
-                return cursor.fetchall()
+                self._chapters_cache = cursor.fetchall()
+                self._chapters_version = version
+                return self._chapters_cache
         except Exception as e:
-            print(f"[WARNING] Could not load chapters: {e}")
+            logger.warning("Could not load chapters: %s", e)
             return []
     
-    def _calculate_chapter_score(self, query: str, title: str, text: str) -> float:
+    def _count_chapters(self) -> int:
+        """Count chapters without loading their text."""
+        try:
+            with self._conn_lock:
+                return self._connection().execute("SELECT COUNT(*) FROM chapters").fetchone()[0]
+        except Exception as e:
+            logger.warning("Could not count chapters: %s", e)
+            return 0
+    
+    def _lowercase_chapters(self, chapters: List[tuple]) -> List[Tuple[str, str]]:
+        """
+        Return (title_lower, full_content_lower) per chapter, reusing the
+        lowercased copies from earlier searches while a chapter's title and
+        text are unchanged (edits keep created_at, so compare the content).
+        """
+        cache = self._lowercase_cache
+        fresh = {}
+        lowered = []
+        for chapter_id, title, text, _ in chapters:
+            title = title or ""
+            text = text or ""
+            entry = cache.get(chapter_id)
+            if entry is None or entry[0] != title or entry[1] != text:
+                entry = (title, text, title.lower(), (title + " " + text).lower())
+            fresh[chapter_id] = entry
+            lowered.append((entry[2], entry[3]))
+        # Keep only current chapters so deleted ones don't linger
+        self._lowercase_cache = fresh
+        return lowered
+    
+    def _query_keywords(self, query: str) -> List[str]:
+        """Split a query into lowercased search terms longer than two characters."""
+        return [word.lower().strip() for word in query.split() if len(word.strip()) > 2]
+    
+    def _calculate_chapter_score(self, keywords: List[str], title_lower: str, full_content: str) -> float:
         """Calculate relevance score for a chapter using simple keyword matching."""
-        if not query.strip():
-            return 0.0
-        
-        # Prepare search terms
-        keywords = [word.lower().strip() for word in query.split() if len(word.strip()) > 2]
         if not keywords:
             return 0.1  # Small score for very short queries
         
-        # Combine title and text for searching
-        full_content = (title + " " + text).lower()
-        
         score = 0.0
         
-        # Score each keyword
+        # Score each keyword (one count() pass; a non-zero count is also the
+        # "keyword in full_content" test). str.count is CPython's C substring
+        # search; keep it rather than JIT-compiling this loop, as Numba's
+        # unicode string operations are slower than CPython's own
         for keyword in keywords:
-            # Exact word matches get high score
             word_count = full_content.count(keyword)
             if word_count > 0:
-                score += word_count * 2.0
-            
-            # Partial matches get lower score
-            if keyword in full_content:
-                score += 0.5
+                # Exact word matches get high score, plus the partial-match bonus
+                score += word_count * 2.0 + 0.5
         
         # Bonus for title matches
-        title_lower = title.lower()
         for keyword in keywords:
             if keyword in title_lower:
                 score += 3.0
@@ -87,42 +150,48 @@ class VectorSearchService:
     
     def search_similar_content(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """BULLETPROOF search that returns FULL chapter context."""
-        print(f"[SEARCH] Looking for: '{query}'")
+        logger.info("[SEARCH] Looking for: '%s'", query)
         
         if not query.strip():
-            print("[SEARCH] Empty query, returning recent chapters")
+            logger.info("[SEARCH] Empty query, returning recent chapters")
             return self._get_fallback_chapters(2)
         
         try:
             # Get all chapters
             chapters = self._get_all_chapters()
             if not chapters:
-                print("[WARNING] No chapters found in database")
+                logger.warning("No chapters found in database")
                 return []
             
-            print(f"[SEARCH] Searching through {len(chapters)} chapters")
+            logger.info("[SEARCH] Searching through %d chapters", len(chapters))
             
             # Score each chapter
+            keywords = self._query_keywords(query)
             scored_chapters = []
-            for chapter_id, title, text, created_at in chapters:
-                score = self._calculate_chapter_score(query, title or "", text or "")
+            for (chapter_id, title, text, created_at), (title_lower, full_content) in zip(
+                chapters, self._lowercase_chapters(chapters)
+            ):
+                score = self._calculate_chapter_score(keywords, title_lower, full_content)
                 if score > 0:
                     scored_chapters.append((score, chapter_id, title, text, created_at))
             
-            # Sort by score (highest first)
-            scored_chapters.sort(key=lambda x: x[0], reverse=True)
+            # Highest scores first; nlargest keeps the stable order of equal
+            # scores that a full reverse sort would, without sorting every chapter
+            top_chapters = heapq.nlargest(top_k, scored_chapters, key=lambda x: x[0])
+            
+            # Similarities are normalized against the whole search, not just top_k
+            if top_chapters:
+                max_score = top_chapters[0][0]  # Highest score in this search
+                min_score = min(c[0] for c in scored_chapters) if len(scored_chapters) > 1 else 0
             
             # Convert to SearchResult format with FULL chapter text
             results = []
-            for i, (score, chapter_id, title, text, created_at) in enumerate(scored_chapters[:top_k]):
+            for i, (score, chapter_id, title, text, created_at) in enumerate(top_chapters):
                 # Use FULL chapter text, not tiny snippets
                 full_text = text or ""
                 
                 # Calculate realistic similarity score (0-1 range)
                 if scored_chapters:
-                    max_score = scored_chapters[0][0]  # Highest score in this search
-                    min_score = scored_chapters[-1][0] if len(scored_chapters) > 1 else 0
-                    
                     if max_score > min_score:
                         # Normalize: best match = 95%, others scale down
                         similarity = 0.95 * (score - min_score) / (max_score - min_score)
@@ -144,18 +213,18 @@ class VectorSearchService:
                 
                 results.append(SearchResult(chunk=chunk, similarity=similarity))
             
-            print(f"[SUCCESS] Found {len(results)} relevant chapters")
+            logger.info("[SEARCH] Found %d relevant chapters", len(results))
             
             # If no matches, provide fallback
             if not results:
-                print("[FALLBACK] No keyword matches, providing recent chapters")
+                logger.info("[FALLBACK] No keyword matches, providing recent chapters")
                 return self._get_fallback_chapters(2)
             
             return results
             
         except Exception as e:
-            print(f"[ERROR] Search failed: {e}")
-            print("[FALLBACK] Using emergency fallback")
+            logger.error("Search failed: %s", e)
+            logger.warning("[FALLBACK] Using emergency fallback")
             return self._get_fallback_chapters(2)
     
     def _get_fallback_chapters(self, count: int = 2) -> List[SearchResult]:
@@ -182,27 +251,27 @@ class VectorSearchService:
                 
                 results.append(SearchResult(chunk=chunk, similarity=0.3))  # Low but valid score
             
-            print(f"[FALLBACK] Providing {len(results)} recent chapters")
+            logger.info("[FALLBACK] Providing %d recent chapters", len(results))
             return results
             
         except Exception as e:
-            print(f"[ERROR] Even fallback failed: {e}")
+            logger.error("Even fallback failed: %s", e)
             return []
     
     def generate_embeddings_for_chapter(self, chapter_id: str) -> bool:
         """No-op for compatibility - we don't need indexing anymore."""
-        print(f"[INFO] Chapter {chapter_id} ready for search (no indexing needed)")
+        logger.info("Chapter %s ready for search (no indexing needed)", chapter_id)
         return True
     
     def rebuild_all_embeddings(self) -> Dict[str, Any]:
         """No-op for compatibility - we don't need rebuilding anymore."""
-        print("[INFO] Bulletproof search ready - no indexing needed!")
+        logger.info("Bulletproof search ready - no indexing needed!")
         
         try:
-            chapters = self._get_all_chapters()
+            chapter_count = self._count_chapters()
             return {
-                "total_chapters": len(chapters),
-                "success_count": len(chapters),
+                "total_chapters": chapter_count,
+                "success_count": chapter_count,
                 "failed_count": 0,
                 "failed_chapters": [],
                 "message": "Bulletproof search ready - no indexing required!"
@@ -219,8 +288,7 @@ class VectorSearchService:
     def get_chapter_info(self) -> Dict[str, Any]:
         """Get chapter status - all chapters are always 'ready' with bulletproof search."""
         try:
-            chapters = self._get_all_chapters()
-            total_chapters = len(chapters)
+            total_chapters = self._count_chapters()
             
             return {
                 "total_chapters": total_chapters,
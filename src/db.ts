@@ -34,6 +34,7 @@ export const chapterAudio = sqliteTable('chapter_audio', {
   audioUrl: text('audio_url'),
   duration: integer('duration'), // Duration in seconds
   status: text('status').default('pending'), // pending, processing, completed, error
+  contentHash: text('content_hash'), // SHA-256 of provider|model|voice|text, reused by the AI service
   createdAt: text('created_at').$defaultFn(() => new Date().toISOString()),
   updatedAt: text('updated_at').$defaultFn(() => new Date().toISOString()),
 });
@@ -98,4 +99,17 @@ try {
   }
 } catch (error) {
   console.error('Error during migration:', error);
+}
+
+// Migration: Add content_hash column to existing chapter_audio if it doesn't exist
+try {
+  const audioColumnInfo = database.prepare("PRAGMA table_info(chapter_audio)").all();
+  const hasContentHashColumn = audioColumnInfo.some((col: any) => col.name === 'content_hash');
+  
+  if (!hasContentHashColumn) {
+    console.log('Adding content_hash column to chapter_audio table...');
+    database.exec('ALTER TABLE chapter_audio ADD COLUMN content_hash TEXT');
+  }
+} catch (error) {
+  console.error('Error during migration:', error);
 } 
\ No newline at end of file